@@ -0,0 +1,73 @@
+"""
+공지사항 조회수 (write-behind).
+
+조회할 때마다 DB에 쓰지 않고 캐시 카운터를 incr 해 두었다가
+flush_hits()로 모아서 Notice.hits에 F() 더하기로 반영한다.
+  - manage.py flush_notice_hits (cron 등 주기 실행)
+  - NOTICE_HITS_FLUSH_INTERVAL(초, 기본 300)마다 상세 조회 요청 중 하나가 직접 반영 (None이면 사용 안 함)
+프로세스 간에 카운터를 공유하려면 CACHES가 Redis/파일 같은 공용 캐시여야 한다.
+배포 버전이 바뀌어도 반영 전 조회수가 사라지지 않도록 NOTICE_HITS_CACHE 별칭(설정에서는 persistent) 캐시를 쓴다.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Notice
+
+HITS_KEY = "community:notice:hits:%s"
+FLUSH_LOCK_KEY = "community:notice:hits:flushed"
+FLUSH_INTERVAL = getattr(settings, "NOTICE_HITS_FLUSH_INTERVAL", 60 * 5)
+HITS_CACHE = getattr(settings, "NOTICE_HITS_CACHE", "default")
+
+
+def hits_cache():
+    return caches[HITS_CACHE]
+
+
+def record_hit(notice_id):
+    """조회수 1 증가 (캐시만). 반영 전 누적 조회수를 돌려준다."""
+    key = HITS_KEY % notice_id
+    cache = hits_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        pending = cache.incr(key)
+    except ValueError:
+        # add와 incr 사이에 flush로 지워진 경우
+        cache.set(key, 1, timeout=None)
+        pending = 1
+    return pending
+
+
+def flush_if_due():
+    """마지막 반영 후 FLUSH_INTERVAL초가 지났으면 이번 요청에서 반영 (프로세스/캐시당 한 요청만)"""
+    if FLUSH_INTERVAL and hits_cache().add(FLUSH_LOCK_KEY, 1, FLUSH_INTERVAL):
+        return flush_hits()
+    return 0
+
+
+def flush_hits(batch_size=500):
+    """캐시에 쌓인 조회수를 Notice.hits에 반영. 반영한 조회수 합계를 돌려준다."""
+    cache = hits_cache()
+    flushed = 0
+    notice_ids = list(Notice.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(notice_ids), batch_size):
+        ids = notice_ids[start:start + batch_size]
+        counts = cache.get_many([HITS_KEY % pk for pk in ids])
+        counts = {int(key.rsplit(":", 1)[1]): value for key, value in counts.items() if value}
+        if not counts:
+            continue
+        with transaction.atomic():
+            Notice.objects.filter(id__in=counts).update(hits=F("hits") + Case(
+                *[When(id=pk, then=Value(value)) for pk, value in counts.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            ))
+        # 읽은 뒤에 들어온 조회수는 남기고 반영한 만큼만 뺌
+        for pk, value in counts.items():
+            try:
+                cache.decr(HITS_KEY % pk, value)
+            except ValueError:
+                pass
+        flushed += sum(counts.values())
+    return flushed
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from community.hits import flush_hits
+
+
+class Command(BaseCommand):
+    help = "캐시에 모인 공지사항 조회수를 DB(Notice.hits)에 반영합니다. cron 등으로 주기 실행하세요."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        flushed = flush_hits(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"조회수 {flushed}건 반영"))
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Notice
+from .versions import bump_notice_version
+
+
+@receiver(post_save, sender=Notice)
+@receiver(post_delete, sender=Notice)
+def _bump_notice_version(sender, **kwargs):
+    bump_notice_version()
@@ -1,3 +1,42 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from . import hits
+from .models import Notice
 
 # Create your tests here.
+
+
+class NoticeHitsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        hits.hits_cache().clear()
+        self.notice = Notice.objects.create(title="휴무 안내", content="내용")
+        # 이번 테스트에서는 요청 중 자동 반영 없이 시작
+        hits.hits_cache().set(hits.FLUSH_LOCK_KEY, 1, 60)
+
+    def test_views_do_not_write_and_flush_in_bulk(self):
+        url = reverse("community:notice_detail", args=[self.notice.pk])
+        for expected in (1, 2, 3):
+            response = self.client.get(url)
+            self.assertEqual(response.context["notice"].hits, expected)
+        self.notice.refresh_from_db()
+        self.assertEqual(self.notice.hits, 0)
+
+        other = Notice.objects.create(title="배송 안내", content="내용")
+        hits.record_hit(other.pk)
+        with self.assertNumQueries(4):  # id 목록 + SAVEPOINT 2 + UPDATE 한 번
+            self.assertEqual(hits.flush_hits(), 4)
+        self.notice.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.notice.hits, other.hits), (3, 1))
+        self.assertEqual(hits.flush_hits(), 0)
+
+    def test_view_flushes_when_due(self):
+        hits.record_hit(self.notice.pk)
+        hits.hits_cache().delete(hits.FLUSH_LOCK_KEY)
+        response = self.client.get(reverse("community:notice_detail", args=[self.notice.pk]))
+        self.assertEqual(response.context["notice"].hits, 2)
+        self.notice.refresh_from_db()
+        self.assertEqual(self.notice.hits, 1)
@@ -0,0 +1,18 @@
+"""
+공지사항 목록 버전 (홈 화면 공지 조각 캐시 키).
+공지가 저장·삭제될 때마다 새 시각으로 바뀐다 (community.signal, doori.versions).
+"""
+from django.conf import settings
+
+from doori.versions import bump_version, get_version
+
+NOTICE_VERSION_KEY = "community:version:notice"
+VERSION_TIMEOUT = getattr(settings, "NOTICE_VERSION_TIMEOUT", 60 * 10)
+
+
+def notice_version():
+    return get_version(NOTICE_VERSION_KEY, VERSION_TIMEOUT)
+
+
+def bump_notice_version():
+    bump_version(NOTICE_VERSION_KEY, timeout=VERSION_TIMEOUT)
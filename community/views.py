@@ -2,13 +2,14 @@ from django.views.generic import ListView, DetailView, CreateView
 from .models import Notice
 from django.shortcuts import get_object_or_404, render, redirect
 from .forms import QuoteInquiryForm, QuoteCommentForm
-from .models import QuoteInquiry
+from .models import QuoteInquiry, QuoteComment
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from .forms import QuoteCommentForm
+from .hits import flush_if_due, record_hit
 
 # Create your views here.
 class NoticeListView(ListView):
@@ -39,12 +40,13 @@ class NoticeListView(ListView):
         return context
 
 def notice_detail(request, pk):
+    flush_if_due()
     notice = get_object_or_404(Notice, pk=pk)
 
     prev_notice = Notice.objects.filter(id__lt=notice.id).order_by('-id').first()
 
-    notice.hits += 1
-    notice.save(update_fields=['hits'])
+    # 조회수는 캐시에 모았다가 flush_notice_hits로 반영 (표시는 반영 전 값 포함)
+    notice.hits += record_hit(notice.pk)
 
     context = {
         'notice': notice,
@@ -91,7 +93,9 @@ class InquiryDetailView(DetailView):
     template_name = "community/inquiry_detail.html"
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = (super().get_queryset()
+              .select_related("user")
+              .prefetch_related(Prefetch("comments", queryset=QuoteComment.objects.select_related("author"))))
         u = self.request.user
         if u.is_staff:
             return qs
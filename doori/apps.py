@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class DooriConfig(AppConfig):
+    """프로젝트 공용 앱 (요청 계측, 프로젝트 전체 관리 명령)"""
+    name = 'doori'
+
+    def ready(self):
+        from .middleware import install_template_timing
+
+        install_template_timing()
@@ -0,0 +1,76 @@
+import time
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+# 워커(프로세스)끼리 공유되지 않는 백엔드
+PROCESS_LOCAL_BACKENDS = ("LocMemCache", "DummyCache")
+# 공유는 되지만 incr/decr이 프로세스끼리 원자적이지 않은 백엔드 (조회수 버퍼, 조회 횟수 제한이 틀어짐)
+NON_ATOMIC_COUNTER_BACKENDS = ("FileBasedCache",)
+
+
+def _masked(location):
+    """접속 주소의 비밀번호는 가림"""
+    if isinstance(location, (list, tuple)):
+        return ", ".join(_masked(loc) for loc in location)
+    parts = urlsplit(str(location))
+    if parts.password:
+        netloc = parts.netloc.replace(f":{parts.password}@", ":***@")
+        return urlunsplit(parts._replace(netloc=netloc))
+    return str(location)
+
+
+class Command(BaseCommand):
+    help = "CACHES 별칭마다 쓰기/읽기/증가/삭제를 해 보고 응답 시간과 설정을 출력합니다 (배포 후 점검용)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alias", action="append", help="점검할 캐시 별칭 (여러 번 지정 가능, 기본은 전체)")
+
+    def handle(self, *args, **options):
+        aliases = options["alias"] or list(settings.CACHES)
+        unknown = set(aliases) - set(settings.CACHES)
+        if unknown:
+            raise CommandError(f"없는 캐시 별칭: {', '.join(sorted(unknown))}")
+
+        failed = []
+        for alias in aliases:
+            config = settings.CACHES[alias]
+            backend = config["BACKEND"].rsplit(".", 1)[-1]
+            self.stdout.write(f"[{alias}] {backend} {_masked(config.get('LOCATION', ''))} "
+                              f"(KEY_PREFIX={config.get('KEY_PREFIX', '')!r})")
+            try:
+                elapsed = self.probe(caches[alias])
+            except Exception as exc:
+                failed.append(alias)
+                self.stderr.write(self.style.ERROR(f"  실패: {exc.__class__.__name__}: {exc}"))
+                continue
+
+            self.stdout.write(self.style.SUCCESS(f"  정상 ({elapsed:.1f}ms)"))
+            if backend in PROCESS_LOCAL_BACKENDS:
+                self.stdout.write(self.style.WARNING(
+                    "  주의: 워커끼리 공유되지 않는 캐시입니다. 운영에서는 CACHE_URL을 redis:// 로 지정하세요."
+                ))
+            elif backend in NON_ATOMIC_COUNTER_BACKENDS:
+                self.stdout.write(self.style.WARNING(
+                    "  주의: incr이 프로세스끼리 원자적이지 않아 조회수 버퍼/조회 횟수 제한이 동시 요청을 놓칩니다. "
+                    "운영에서는 CACHE_URL을 redis:// 로 지정하세요."
+                ))
+
+        if failed:
+            raise CommandError(f"캐시 점검 실패: {', '.join(failed)}")
+
+    def probe(self, cache):
+        key = f"cache_health:{uuid.uuid4().hex}"
+        start = time.perf_counter()
+        try:
+            cache.set(key, 1, 30)
+            if cache.get(key) != 1:
+                raise RuntimeError("저장한 값을 다시 읽지 못했습니다.")
+            if cache.incr(key) != 2:
+                raise RuntimeError("incr 결과가 올바르지 않습니다.")
+        finally:
+            cache.delete(key)
+        return (time.perf_counter() - start) * 1000
@@ -0,0 +1,136 @@
+"""
+요청별 계측 (SQL 수/시간, 템플릿 렌더링 시간, 뷰 이름).
+
+connection.execute_wrapper로 요청 중 실행된 쿼리를 모두 재고
+  - 응답에 Server-Timing 헤더 (브라우저 개발자도구 Network > Timing에서 확인)
+  - REQUEST_TIMING_SLOW_MS(기본 500ms) 이상 걸린 요청은 "doori.requests" 로거로 JSON 한 줄
+    (느린 쿼리 순 SQL과 그 쿼리를 부른 프로젝트 코드 위치 포함)
+를 남긴다. MIDDLEWARE 맨 앞에 두어야 세션/인증 쿼리까지 잡힌다.
+쿼리를 부른 위치는 스택을 거슬러 올라가야 해서 비싸므로, 요청이 이미 기준 시간을 넘긴 뒤의 쿼리만 기록한다.
+템플릿 렌더링 시간은 install_template_timing()을 DooriConfig.ready()에서 한 번 걸어 잰다.
+
+설정
+  REQUEST_TIMING_HEADER        Server-Timing 헤더 사용 여부 (기본 DEBUG - 운영 응답에 뷰 이름/쿼리 수를 노출하지 않음)
+  REQUEST_TIMING_SLOW_MS       느린 요청 기준 ms (None이면 기록 안 함)
+  REQUEST_TIMING_MAX_QUERIES   느린 요청 로그에 남길 쿼리 수 (기본 20)
+"""
+import json
+import logging
+import sys
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template as DjangoTemplate
+
+logger = logging.getLogger("doori.requests")
+
+_current = ContextVar("request_timing", default=None)
+_PROJECT_DIR = str(settings.BASE_DIR)
+_SKIP_DIRS = ("site-packages", "dist-packages")
+
+
+def _origin():
+    """쿼리를 실행한 프로젝트 코드 위치 (django/라이브러리/이 모듈 프레임은 건너뜀)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(_PROJECT_DIR) and filename != __file__
+                and not any(d in filename for d in _SKIP_DIRS)):
+            return f"{filename[len(_PROJECT_DIR) + 1:]}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return ""
+
+
+class RequestTimings:
+    """한 요청의 측정값 (origin_after_ms: 요청 시작 후 이 시간이 지난 뒤의 쿼리만 호출 위치 기록, None이면 안 함)"""
+
+    def __init__(self, origin_after_ms=None):
+        self.origin_after_ms = origin_after_ms
+        self.started = time.perf_counter()
+        self.queries = []       # (ms, sql, origin)
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            end = time.perf_counter()
+            ms = (end - start) * 1000
+            self.db_ms += ms
+            slow = self.origin_after_ms is not None and (end - self.started) * 1000 >= self.origin_after_ms
+            self.queries.append((ms, sql, _origin() if slow else ""))
+
+
+def _timed_render(render):
+    def wrapper(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return render(self, context, request)
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            timings.template_ms += (time.perf_counter() - start) * 1000
+    wrapper.__wrapped__ = render
+    return wrapper
+
+
+def install_template_timing():
+    """render()/TemplateResponse가 거치는 백엔드 템플릿만 감쌈 ({% include %}는 여기를 다시 지나지 않아 중복 없음)"""
+    if not hasattr(DjangoTemplate.render, "__wrapped__"):
+        DjangoTemplate.render = _timed_render(DjangoTemplate.render)
+
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = getattr(settings, "REQUEST_TIMING_HEADER", settings.DEBUG)
+        self.slow_ms = getattr(settings, "REQUEST_TIMING_SLOW_MS", 500)
+        self.max_queries = getattr(settings, "REQUEST_TIMING_MAX_QUERIES", 20)
+
+    def __call__(self, request):
+        timings = RequestTimings(origin_after_ms=self.slow_ms)
+        token = _current.set(timings)
+        start = timings.started
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+                # 지연 렌더링(TemplateResponse)은 미들웨어 체인 안에서 끝나므로 여기까지 포함됨
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        match = request.resolver_match
+        view_name = (match.view_name or match._func_path) if match else ""
+
+        if self.header:
+            response["Server-Timing"] = ", ".join([
+                f'db;desc="SQL x{len(timings.queries)}";dur={timings.db_ms:.1f}',
+                f'tpl;desc="Template";dur={timings.template_ms:.1f}',
+                f'app;desc="{view_name or "-"}";dur={total_ms:.1f}',
+            ])
+
+        if self.slow_ms is not None and total_ms >= self.slow_ms:
+            self.log_slow(request, response, view_name, total_ms, timings)
+        return response
+
+    def log_slow(self, request, response, view_name, total_ms, timings):
+        slowest = sorted(timings.queries, key=lambda q: q[0], reverse=True)[:self.max_queries]
+        logger.warning(json.dumps({
+            "method": request.method,
+            "path": request.get_full_path(),
+            "view": view_name,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 1),
+            "db_ms": round(timings.db_ms, 1),
+            "template_ms": round(timings.template_ms, 1),
+            "query_count": len(timings.queries),
+            "queries": [{"ms": round(ms, 2), "sql": sql, "origin": origin} for ms, sql, origin in slowest],
+        }, ensure_ascii=False))
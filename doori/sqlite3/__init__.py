@@ -0,0 +1 @@
+"""연결할 때 PRAGMA를 적용하는 SQLite 백엔드 (ENGINE: doori.sqlite3)"""
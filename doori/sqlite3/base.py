@@ -0,0 +1,69 @@
+"""
+django.db.backends.sqlite3 + 연결 직후 PRAGMA 적용.
+
+기본값 (SQLITE_PRAGMAS에 적은 항목만 덮어씀)
+  journal_mode=WAL       읽기가 쓰기(주문 접수 등)를 기다리지 않고, 쓰기도 읽기를 막지 않음
+  synchronous=NORMAL     WAL에서는 커밋마다 fsync 하지 않아도 DB가 깨지지 않음 (정전 시 마지막 커밋만 유실 가능)
+  busy_timeout=5000      다른 연결이 쓰는 중이면 바로 "database is locked" 대신 최대 5초 대기
+  mmap_size=128MB        읽기를 메모리 매핑으로
+
+atomic 블록은 SQLITE_TRANSACTION_MODE(기본 "", 장고와 같은 지연 BEGIN)로 시작한다.
+읽기 위주의 트랜잭션(관리자 화면, 세션 저장 등)까지 쓰기 잠금을 기다리지 않도록 전역 기본값은 그대로 두고,
+읽고 나서 쓰는 트랜잭션(주문 접수)만 immediate_transaction()으로 BEGIN IMMEDIATE를 쓴다.
+SQLite에서는 select_for_update가 아무것도 잠그지 않으므로 동시 주문은 이 잠금으로 차례를 지키고,
+쓰기 잠금으로 올리다 바로 실패하는 대신 busy_timeout만큼 기다린다.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 128 * 1024 * 1024,
+}
+TRANSACTION_MODES = ("", "DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+DEFAULT_TRANSACTION_MODE = ""
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # immediate_transaction()이 다음 BEGIN 한 번만 바꿔 쓰는 모드
+    begin_mode = None
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        pragmas = {**DEFAULT_PRAGMAS, **getattr(settings, "SQLITE_PRAGMAS", {})}
+        for name, value in pragmas.items():
+            if self.is_in_memory_db() and name == "journal_mode":
+                continue  # 메모리 DB(테스트)는 WAL을 쓸 수 없음
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = (self.begin_mode or getattr(settings, "SQLITE_TRANSACTION_MODE", DEFAULT_TRANSACTION_MODE)).upper()
+        if mode not in TRANSACTION_MODES:
+            raise ValueError(f"SQLITE_TRANSACTION_MODE must be one of {TRANSACTION_MODES}")
+        self.cursor().execute(f"BEGIN {mode}".strip())
+
+
+@contextmanager
+def immediate_transaction(using=None):
+    """
+    transaction.atomic()과 같지만 이 백엔드에서는 BEGIN IMMEDIATE로 시작해 처음부터 쓰기 잠금을 잡는다.
+    다른 DB이거나 이미 트랜잭션 안이면 atomic() 그대로 (바깥 트랜잭션의 모드를 따름).
+    """
+    connection = transaction.get_connection(using)
+    immediate = isinstance(connection, DatabaseWrapper) and not connection.in_atomic_block
+    if immediate:
+        connection.begin_mode = "IMMEDIATE"
+    try:
+        with transaction.atomic(using=using):
+            if immediate:
+                connection.begin_mode = None  # 안쪽에서 새로 여는 트랜잭션은 기본 모드
+            yield
+    finally:
+        if immediate:
+            connection.begin_mode = None
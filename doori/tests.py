@@ -0,0 +1,451 @@
+"""
+프로젝트 공용 테스트.
+
+URL별 쿼리 수 상한 (QueryBudgetTest)
+  실제 규모에 가까운 카탈로그(부품 수천 개, 부품당 이미지 여러 장, 주문 수백 건)를 만들어 두고
+  parts/shop/community/user의 모든 URL과 홈 화면이 정해진 쿼리 수 이하로 응답하는지 확인한다.
+  목록/상세에서 행마다 쿼리가 나가는 N+1이 생기면 여기서 실패한다.
+  상한을 올려야 한다면 왜 늘었는지 먼저 확인할 것.
+그 밖에 요청 계측 미들웨어, 홈 조각 캐시, SQLite 연결 설정, cache_health 명령.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from doori.sqlite3.base import DatabaseWrapper, immediate_transaction
+from community.models import Notice, Notice_Image, QuoteComment, QuoteInquiry
+from parts.models import CarManufacturer, CarModel, CarModelDetail, Part, PartImage, PartSubCategory
+from parts.search import build_bigram_document
+from shop.cart import CART_SESSION_ID
+from shop.models import Order, OrderItem
+from user.models import User
+
+PART_COUNT = 2000
+IMAGES_PER_PART = 3
+ORDER_COUNT = 300
+
+
+def seed_catalog():
+    manufacturers = CarManufacturer.objects.bulk_create(
+        CarManufacturer(name=f"제조사{i}", is_imported=i % 2 == 1) for i in range(6)
+    )
+    models = CarModel.objects.bulk_create(
+        CarModel(manufacturer=manufacturers[i % len(manufacturers)], name=f"차종{i}") for i in range(40)
+    )
+    details = CarModelDetail.objects.bulk_create(
+        CarModelDetail(model=models[i % len(models)], name=f"세부{i}") for i in range(80)
+    )
+    categories = [choice for choice, _ in PartSubCategory._meta.get_field("parent_category").choices]
+    subcategories = PartSubCategory.objects.bulk_create(
+        PartSubCategory(parent_category=categories[i % len(categories)], name=f"분류{i}") for i in range(20)
+    )
+
+    parts = []
+    for i in range(PART_COUNT):
+        detail = details[i % len(details)]
+        subcategory = subcategories[i % len(subcategories)]
+        part_number = f"{86500 + i % 97}-2S{i:04d}"
+        document = f"부품 {i} {part_number} {detail.model.name} {detail.name} {subcategory.name}"
+        parts.append(Part(
+            title=f"부품 {i}",
+            car_model=detail.model,
+            car_model_detail=detail,
+            subcategory=subcategory,
+            parent_category=subcategory.parent_category,
+            part_number=part_number,
+            part_number_normalized=part_number.replace("-", ""),
+            applicable_years="2015-2018",
+            year_from=2015,
+            year_to=2018,
+            stock=i % 5,
+            price=0 if i % 10 == 0 else 10000 + i,
+            search_document=document,
+            search_bigrams=build_bigram_document(document),
+        ))
+    parts = Part.objects.bulk_create(parts, batch_size=500)
+    PartImage.objects.bulk_create(
+        (PartImage(part=part, image=f"parts/{part.id}_{n}.jpg") for part in parts for n in range(IMAGES_PER_PART)),
+        batch_size=1000,
+    )
+    return {
+        "manufacturer": manufacturers[0],
+        "car_model": models[0],
+        "detail": details[0],
+        "subcategory": subcategories[0],
+        "category": categories[0],
+        "parts": parts,
+    }
+
+
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalog = seed_catalog()
+        cls.part = cls.catalog["parts"][1]
+
+        cls.member = User.objects.create_user("member01", "pw-1234!", "홍길동", "member@example.com", "010-1111-2222")
+        cls.staff = User.objects.create_user("staff01", "pw-1234!", "관리자", "staff@example.com", "010-3333-4444",
+                                             is_staff=True)
+
+        orders = Order.objects.bulk_create(
+            Order(user=cls.member if i % 3 else None, guest_name=f"손님{i}", guest_hp=f"010-5555-{i:04d}",
+                  total_amount=20000, item_count=2)
+            for i in range(ORDER_COUNT)
+        )
+        parts = cls.catalog["parts"]
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, part=parts[(i * 7 + n) % len(parts)], title=f"부품 {i}-{n}",
+                      unit_price=10000, quantity=1)
+            for i, order in enumerate(orders) for n in range(2)
+        )
+        cls.guest_order = Order.objects.create(guest_name="김철수", guest_hp="010-1234-5678",
+                                               guest_password=make_password("secret"))
+
+        notices = Notice.objects.bulk_create(Notice(title=f"공지 {i}", content="내용") for i in range(30))
+        Notice_Image.objects.bulk_create(
+            Notice_Image(notice=notice, image=f"notices/images/{notice.id}_{n}.jpg") for notice in notices for n in range(2)
+        )
+        cls.notice = notices[-1]
+
+        inquiries = QuoteInquiry.objects.bulk_create(
+            QuoteInquiry(user=cls.member, title=f"견적 {i}", content="내용", is_private=i % 4 == 0) for i in range(40)
+        )
+        QuoteComment.objects.bulk_create(
+            QuoteComment(inquiry=inquiry, author=cls.staff, content="답변", is_from_admin=True)
+            for inquiry in inquiries for _ in range(3)
+        )
+        cls.inquiry = inquiries[1]
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, user):
+        self.client.force_login(user)
+
+    def fill_cart(self, count=5):
+        session = self.client.session
+        session[CART_SESSION_ID] = {str(p.id): {"qty": 1} for p in self.catalog["parts"][1:count + 1]}
+        session.save()
+
+    def assertBudget(self, budget, method, url, data=None, status=None, **kwargs):
+        """캐시가 빈 상태(최악)에서 쿼리 수가 budget 이하인지"""
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, data, **kwargs) if data is not None \
+                else getattr(self.client, method)(url, **kwargs)
+        if status is not None:
+            self.assertEqual(response.status_code, status, url)
+        else:
+            self.assertLess(response.status_code, 400, url)
+        queries = [q["sql"] for q in ctx.captured_queries]
+        self.assertLessEqual(len(queries), budget, f"{method.upper()} {url}: {len(queries)} queries\n" +
+                             "\n".join(f"{i}. {sql}" for i, sql in enumerate(queries, 1)))
+        return response
+
+    # ── 홈 ──
+    def test_home(self):
+        self.assertBudget(4, "get", reverse("index"))
+        self.assertBudget(1, "get", reverse("company"))
+
+    # ── parts ──
+    def test_parts_listings(self):
+        c = self.catalog
+        urls = [
+            reverse("parts:product_list"),
+            reverse("parts:product_by_manufacturer", args=[c["manufacturer"].id]),
+            reverse("parts:product_by_category", args=[c["category"]]),
+            reverse("parts:product_by_model", args=[c["car_model"].id]),
+            reverse("parts:product_by_model_detail", args=[c["detail"].id]),
+            reverse("parts:product_by_subcategory", args=[c["subcategory"].id]),
+        ]
+        for url in urls:
+            for query in ("", "?sort=low_price&page=3", "?q=부품&year=2016", "?q=86501-2S"):
+                self.assertBudget(7, "get", url + query)
+
+    def test_parts_detail(self):
+        self.assertBudget(3, "get", reverse("parts:product_detail", args=[self.part.id]))
+
+    # ── shop ──
+    def test_shop_cart(self):
+        self.fill_cart()
+        self.assertBudget(4, "get", reverse("shop:cart_detail"))
+        self.assertBudget(5, "post", reverse("shop:add", args=[self.part.id]), {"qty": 1}, status=302)
+        self.assertBudget(5, "post", reverse("shop:update", args=[self.part.id]), {"qty": 2}, status=302)
+        self.assertBudget(4, "post", reverse("shop:remove", args=[self.part.id]), status=302)
+
+    def test_shop_cart_api(self):
+        self.fill_cart()
+        payload = json.dumps({"product_id": self.part.id, "qty": 2})
+        for name in ("shop:add_ajax", "shop:update_ajax", "shop:remove_ajax"):
+            self.assertBudget(5, "post", reverse(name), payload, content_type="application/json")
+        self.assertBudget(2, "get", reverse("shop:summary_ajax"))
+
+    def test_shop_order(self):
+        self.fill_cart()
+        self.assertBudget(4, "get", reverse("shop:order_form"))
+        self.assertBudget(3, "get", reverse("shop:order_form") + f"?part_id={self.part.id}&qty=1")
+        self.assertBudget(7, "post", reverse("shop:order_create"), {
+            "guest_name": "홍길동", "guest_hp": "010-1234-5678",
+            "guest_email": "a@example.com", "guest_password": "1234",
+        }, status=302)
+        order = Order.objects.latest("id")
+        self.assertBudget(4, "get", reverse("shop:order_complete", args=[order.id]))
+        self.assertBudget(5, "get", reverse("shop:buy_now", args=[self.part.id]), status=302)
+
+    def test_shop_guest_lookup(self):
+        self.assertBudget(2, "get", reverse("shop:guest_lookup"))
+        response = self.assertBudget(4, "post", reverse("shop:guest_lookup"),
+                                     {"name": "김철수", "hp": "01012345678", "password": "secret"})
+        self.assertEqual(response.context["order"], self.guest_order)
+
+    # ── community ──
+    def test_community(self):
+        self.assertBudget(4, "get", reverse("community:notice_list"))
+        self.assertBudget(5, "get", reverse("community:notice_detail", args=[self.notice.id]))
+        self.assertBudget(3, "get", reverse("community:quotes_list"))
+        self.assertBudget(3, "get", reverse("community:quotes_detail", args=[self.inquiry.id]))
+
+        self.login(self.member)
+        self.assertBudget(5, "get", reverse("community:quotes_list"))
+        self.assertBudget(5, "get", reverse("community:quotes_detail", args=[self.inquiry.id]))
+        self.assertBudget(3, "get", reverse("community:quotes_create"))
+        self.assertBudget(4, "post", reverse("community:close", args=[self.inquiry.id]), status=302)
+
+        self.login(self.staff)
+        self.assertBudget(5, "get", reverse("community:quotes_list"))
+        self.assertBudget(4, "post", reverse("community:comment_create", args=[self.inquiry.id]),
+                          {"content": "확인했습니다."}, status=302)
+
+    # ── user ──
+    def test_user_anonymous(self):
+        for name in ("user:login", "user:register", "user:register_terms", "user:find_id",
+                     "user:find_id_done", "user:password_reset_match", "user:password_reset_match_new"):
+            self.assertBudget(2, "get", reverse(name))
+
+    def test_user_member(self):
+        self.login(self.member)
+        self.assertBudget(3, "get", reverse("user:password_confirm"))
+        self.assertBudget(2, "get", reverse("user:profile_edit"))
+        response = self.assertBudget(6, "get", reverse("user:mypage"))
+        self.assertGreater(response.context["page_obj"].paginator.count, 100)
+        self.assertBudget(6, "get", reverse("user:mypage") + "?page=20")
+        self.assertBudget(4, "get", reverse("user:logout"))
+        self.login(self.member)
+        self.assertBudget(5, "post", reverse("user:account_delete"), status=302)
+
+
+class RequestTimingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed = CarManufacturer.objects.create(name="현대")
+        cls.part = Part.objects.create(title="헤드램프", car_model=CarModel.objects.create(manufacturer=seed, name="아반떼"),
+                                       price=10000, stock=1)
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(REQUEST_TIMING_HEADER=True)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("parts:product_detail", args=[self.part.id]))
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;desc="SQL x\d+";dur=[\d.]+')
+        self.assertIn("tpl;", timing)
+        self.assertIn('app;desc="parts:product_detail"', timing)
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=0, REQUEST_TIMING_MAX_QUERIES=1)
+    def test_slow_request_logged_as_json(self):
+        with self.assertLogs("doori.requests", "WARNING") as logs:
+            self.client.get(reverse("parts:product_detail", args=[self.part.id]) + "?from=test")
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry["view"], "parts:product_detail")
+        self.assertEqual(entry["path"], f"/parts/{self.part.id}/detail/?from=test")
+        self.assertEqual(entry["status"], 200)
+        self.assertGreaterEqual(entry["query_count"], 2)
+        self.assertEqual(len(entry["queries"]), 1)
+        self.assertTrue(all(q["origin"] and not q["origin"].startswith("/") for q in entry["queries"]))
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=None)
+    def test_fast_request_not_logged(self):
+        with self.assertNoLogs("doori.requests"):
+            self.client.get(reverse("company"))
+
+    @override_settings(REQUEST_TIMING_HEADER=False)
+    def test_header_can_be_disabled(self):
+        response = self.client.get(reverse("parts:product_detail", args=[self.part.id]))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_template_timing_installed_once(self):
+        from django.template.backends.django import Template
+        from doori.middleware import install_template_timing
+
+        wrapped = Template.render
+        self.assertTrue(hasattr(wrapped, "__wrapped__"))
+        install_template_timing()
+        self.assertIs(Template.render, wrapped)
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=60 * 1000)
+    def test_no_origin_capture_before_slow_threshold(self):
+        # 기준 시간을 넘기기 전의 쿼리는 호출 위치를 찾지 않음
+        with mock.patch("doori.middleware._origin") as origin:
+            self.client.get(reverse("parts:product_detail", args=[self.part.id]))
+        origin.assert_not_called()
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=None)
+    def test_no_origin_capture_without_slow_log(self):
+        with mock.patch("doori.middleware._origin") as origin:
+            self.client.get(reverse("parts:product_detail", args=[self.part.id]))
+        origin.assert_not_called()
+
+
+class HomeFragmentCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = CarManufacturer.objects.create(name="현대")
+        cls.car_model = CarModel.objects.create(manufacturer=manufacturer, name="아반떼")
+        cls.part = Part.objects.create(title="헤드램프", car_model=cls.car_model, price=123456)
+        PartImage.objects.create(part=cls.part, image="parts/lamp.jpg")
+        cls.notice = Notice.objects.create(title="설 연휴 배송 안내", content="내용")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_steady_state_has_no_queries(self):
+        first = self.client.get(reverse("index"))
+        self.assertContains(first, "123,456원")
+        self.assertContains(first, "설 연휴 배송 안내")
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("index"))
+        self.assertContains(response, "123,456원")
+        self.assertContains(response, "parts/lamp.jpg")
+
+    def test_part_and_image_changes_regenerate_grid(self):
+        self.client.get(reverse("index"))
+        Part.objects.create(title="테일램프", car_model=self.car_model, price=0)
+        self.assertContains(self.client.get(reverse("index")), "테일램프")
+
+        PartImage.objects.create(part=self.part, image="parts/lamp-new.jpg")
+        PartImage.objects.filter(image="parts/lamp.jpg").delete()
+        self.assertContains(self.client.get(reverse("index")), "parts/lamp-new.jpg")
+
+    def test_notice_change_regenerates_notices(self):
+        self.client.get(reverse("index"))
+        self.notice.title = "배송 지연 안내"
+        self.notice.save()
+        response = self.client.get(reverse("index"))
+        self.assertContains(response, "배송 지연 안내")
+        self.assertNotContains(response, "설 연휴 배송 안내")
+
+
+class SQLitePragmaTest(TestCase):
+    def open(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": os.path.join(directory, "test.sqlite3")})
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(connection.settings_dict["ENGINE"], "doori.sqlite3")
+        wrapper = self.open()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 5000)
+        self.assertEqual(self.pragma(wrapper, "foreign_keys"), 1)
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 250})
+    def test_pragma_overrides_merge_with_defaults(self):
+        wrapper = self.open()
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 250)
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+
+    def test_readers_not_blocked_by_open_write(self):
+        wrapper = self.open()
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE t (v integer)")
+            cursor.execute("INSERT INTO t VALUES (1)")
+        wrapper._start_transaction_under_autocommit()
+        with wrapper.cursor() as cursor:
+            cursor.execute("INSERT INTO t VALUES (2)")
+
+        reader = sqlite3.connect(wrapper.settings_dict["NAME"], timeout=0)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.execute("SELECT count(*) FROM t").fetchone()[0], 1)
+        wrapper.connection.commit()
+
+    @override_settings(SQLITE_TRANSACTION_MODE="IMMEDIATE")
+    def test_immediate_transaction_mode_setting(self):
+        wrapper = self.open()
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE t (v integer)")
+        wrapper._start_transaction_under_autocommit()
+        self.assertWriteLocked(wrapper)
+        wrapper.connection.rollback()
+
+    def assertWriteLocked(self, wrapper, locked=True):
+        writer = sqlite3.connect(wrapper.settings_dict["NAME"], timeout=0)
+        self.addCleanup(writer.close)
+        if locked:
+            with self.assertRaises(sqlite3.OperationalError):
+                writer.execute("INSERT INTO t VALUES (1)")
+        else:
+            writer.execute("INSERT INTO t VALUES (1)")
+            writer.commit()
+
+    def test_only_immediate_transaction_takes_write_lock(self):
+        # 기본 atomic은 지연 BEGIN (읽기만 하는 트랜잭션이 쓰기 잠금을 기다리지 않음)
+        wrapper = self.open()
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE t (v integer)")
+        with mock.patch.object(transaction, "get_connection", return_value=wrapper):
+            with transaction.atomic():
+                with wrapper.cursor() as cursor:
+                    cursor.execute("SELECT count(*) FROM t")
+                self.assertWriteLocked(wrapper, locked=False)
+
+            # 주문 접수용 immediate_transaction은 시작부터 쓰기 잠금, 끝나면 다시 기본 모드
+            with immediate_transaction():
+                self.assertWriteLocked(wrapper)
+            self.assertIsNone(wrapper.begin_mode)
+            with transaction.atomic():
+                self.assertWriteLocked(wrapper, locked=False)
+
+
+class CacheHealthCommandTest(TestCase):
+    def test_all_aliases_checked(self):
+        out = StringIO()
+        call_command("cache_health", stdout=out)
+        self.assertIn("[default]", out.getvalue())
+        self.assertIn("[persistent]", out.getvalue())
+        self.assertEqual(out.getvalue().count("정상"), 2)
+
+    def test_unknown_alias(self):
+        with self.assertRaises(CommandError):
+            call_command("cache_health", alias=["nope"])
+
+    def test_file_cache_counter_warning(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        file_cache = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory}
+        out = StringIO()
+        with override_settings(CACHES={"default": file_cache}):
+            call_command("cache_health", stdout=out)
+        self.assertIn("정상", out.getvalue())
+        self.assertIn("원자적이지 않아", out.getvalue())
@@ -0,0 +1,24 @@
+"""
+캐시에 두는 버전 키 (마지막 변경 시각).
+ETag/Last-Modified와 화면 조각 캐시 키에 쓰며, 저장·삭제 신호에서 bump_version으로 새 시각을 넣는다.
+  - parts.conditional   카탈로그/분류 버전
+  - community.versions  공지 버전
+버전 키는 신호로 바뀌지만 프로세스별 캐시(LocMem)에서는 다른 워커에 전달되지 않으므로
+만료도 둔다 (만료되면 새 버전으로 다시 그림).
+"""
+from django.core.cache import cache
+from django.utils import timezone
+
+# 기본 만료 (앱별 설정: PART_PAGE_VERSION_TIMEOUT, NOTICE_VERSION_TIMEOUT)
+VERSION_TIMEOUT = 60 * 10
+
+
+def get_version(key, timeout=VERSION_TIMEOUT):
+    """키의 현재 버전 (없으면 지금 시각으로 만듦)"""
+    return cache.get_or_set(key, timezone.now, timeout)
+
+
+def bump_version(*keys, timeout=VERSION_TIMEOUT):
+    """키들을 같은 새 시각으로 바꿈"""
+    now = timezone.now()
+    cache.set_many({key: now for key in keys}, timeout)
@@ -1,19 +1,40 @@
+from django.conf import settings
+from django.db.models import Prefetch
 from django.shortcuts import render
+from django.utils.functional import SimpleLazyObject
 from community.models import Notice
-from parts.models import Part
+from community.versions import notice_version
+from parts.conditional import catalog_version
+from parts.mixins import format_prices
+from parts.models import Part, PartImage
 
-def home(request):
+# 홈 조각 캐시 만료 (키에 버전이 들어가므로 내용이 바뀌면 만료 전에도 새로 그림)
+HOME_FRAGMENT_TIMEOUT = getattr(settings, "HOME_FRAGMENT_TIMEOUT", 60 * 60)
 
-    notices = Notice.objects.prefetch_related('images').all().order_by('-created_at')[:2]
-    parts = Part.objects.prefetch_related('images').all().order_by('-created_at')[:15]
 
-    for part in parts:
-        try:
-            part.formatted_price = "{:,.0f}".format(part.price)
-        except (ValueError, TypeError):
-            part.formatted_price = part.price
+def home(request):
+    """
+    메인 화면.
+    최신 부품 목록/공지 목록은 카탈로그·공지 버전을 키로 조각 캐시하고,
+    조회는 조각 캐시가 없을 때만 한다 (평소에는 부품/공지 쿼리 없음).
+    """
+    notices = SimpleLazyObject(lambda: list(
+        Notice.objects.only('id', 'title').order_by('-created_at', '-id')[:2]
+    ))
+    parts = SimpleLazyObject(lambda: format_prices(list(
+        Part.objects
+        .only('id', 'title', 'price', 'created_at')
+        .prefetch_related(Prefetch('images', queryset=PartImage.objects.order_by('id')))
+        .order_by('-created_at', '-id')[:15]
+    )))
 
-    return render(request, 'index.html', {'notices': notices, 'parts': parts})
+    return render(request, 'index.html', {
+        'notices': notices,
+        'parts': parts,
+        'catalog_version': catalog_version().timestamp(),
+        'notice_version': notice_version().timestamp(),
+        'fragment_timeout': HOME_FRAGMENT_TIMEOUT,
+    })
 
 def about(request) :
     return render(request, 'about/company.html')
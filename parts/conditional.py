@@ -0,0 +1,74 @@
+"""
+부품 상세/목록 화면의 조건부 GET(ETag/Last-Modified → 304)과 상세 조각 캐시 버전.
+
+  - 상세: Part.updated_at
+      부품 저장, 사진 추가/변경/삭제, 재고 변동, 제조사/차종/분류 이름 변경 때 갱신된다.
+      상세 본문 조각 캐시도 이 값을 키로 쓰므로 따로 지울 필요가 없다.
+  - 목록: 카탈로그 버전 (부품/사진이 저장·삭제될 때마다 새 시각)
+  - 공통: 분류 버전 (상단 제조사 메뉴/사이드바에 보이는 제조사·차종·분류가 바뀔 때 새 시각)
+
+화면에 로그인 여부와 CSRF 토큰이 들어가므로 ETag에 세션/CSRF 쿠키 값을 섞어
+다른 방문자(또는 로그인 전후)의 사본과 구분한다.
+버전 키의 읽기/갱신은 doori.versions.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from doori.versions import bump_version, get_version
+
+CATALOG_VERSION_KEY = "parts:version:catalog"
+TAXONOMY_VERSION_KEY = "parts:version:taxonomy"
+VERSION_TIMEOUT = getattr(settings, "PART_PAGE_VERSION_TIMEOUT", 60 * 10)
+# 상세 본문 조각 캐시 (키에 updated_at이 들어가므로 길게 둬도 됨)
+DETAIL_FRAGMENT_TIMEOUT = getattr(settings, "PART_DETAIL_FRAGMENT_TIMEOUT", 60 * 60 * 24)
+
+
+def catalog_version():
+    return get_version(CATALOG_VERSION_KEY, VERSION_TIMEOUT)
+
+
+def taxonomy_version():
+    return get_version(TAXONOMY_VERSION_KEY, VERSION_TIMEOUT)
+
+
+def bump_catalog_version():
+    bump_version(CATALOG_VERSION_KEY, timeout=VERSION_TIMEOUT)
+
+
+def bump_taxonomy_version():
+    # 분류가 바뀌면 목록 화면도 달라지므로 카탈로그 버전도 함께
+    bump_version(CATALOG_VERSION_KEY, TAXONOMY_VERSION_KEY, timeout=VERSION_TIMEOUT)
+
+
+def visitor_token(request):
+    """세션/CSRF 쿠키로 방문자 구분 (DB 조회 없음)"""
+    cookies = request.COOKIES
+    raw = f"{cookies.get(settings.SESSION_COOKIE_NAME, '')}:{cookies.get(settings.CSRF_COOKIE_NAME, '')}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def make_etag(request, *versions):
+    stamps = "-".join(f"{v.timestamp():.6f}" if hasattr(v, "timestamp") else str(v) for v in versions)
+    return f"{stamps}-{visitor_token(request)}"
+
+
+def conditional_page(etag_func, last_modified_func):
+    """
+    condition()과 같지만 응답에 Cache-Control: private, no-cache를 붙인다.
+    (브라우저가 Last-Modified로 신선도를 추측해 재검증 없이 옛 사본을 쓰지 않도록, 공용 캐시에는 저장 안 되게)
+    """
+    def decorator(func):
+        conditional = condition(etag_func=etag_func, last_modified_func=last_modified_func)(func)
+
+        @wraps(func)
+        def inner(request, *args, **kwargs):
+            response = conditional(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return inner
+    return decorator
@@ -1,7 +1,28 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
 from .models import CarManufacturer, PartSubCategory
 
+MANUFACTURER_MENU_CACHE_KEY = "parts:manufacturer_menu"
+# 신호로 지워짐 (만료를 두는 이유는 doori.versions와 같음)
+MANUFACTURER_MENU_TIMEOUT = getattr(settings, "MANUFACTURER_MENU_TIMEOUT", 60 * 10)
+
+
+def get_manufacturer_menu():
+    """상단 제조사 메뉴 (차량 모델 수 포함) - 캐시"""
+    return cache.get_or_set(
+        MANUFACTURER_MENU_CACHE_KEY,
+        lambda: list(CarManufacturer.objects.annotate(model_count=Count('models')).order_by('id')),
+        MANUFACTURER_MENU_TIMEOUT,
+    )
+
+
+def invalidate_manufacturer_menu():
+    cache.delete(MANUFACTURER_MENU_CACHE_KEY)
+
+
 def global_context(request):
     return {
-        'manufacturers': CarManufacturer.objects.all(),
+        'manufacturers': get_manufacturer_menu(),
         'category_choices': PartSubCategory.PartsCategory.choices
     }
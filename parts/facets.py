@@ -0,0 +1,85 @@
+"""
+목록 사이드바의 개수 칩(차종별/세부차종별/세부카테고리별 부품 수) 캐시.
+부품이 추가·삭제되거나 분류가 바뀌면 해당 그룹 키만 지운다.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import CarModel, CarModelDetail, PartSubCategory
+
+FACET_TIMEOUT = getattr(settings, "PART_FACET_TIMEOUT", 60 * 60)
+
+
+def _models_key(manufacturer_id):
+    return f"parts:facets:models:{manufacturer_id}"
+
+
+def _details_key(car_model_id):
+    return f"parts:facets:details:{car_model_id}"
+
+
+def _subcategories_key(parent_category):
+    return f"parts:facets:subcategories:{parent_category}"
+
+
+def manufacturer_model_facets(manufacturer_id):
+    """제조사의 차량 모델 + 모델별 부품 수"""
+    return cache.get_or_set(
+        _models_key(manufacturer_id),
+        lambda: list(CarModel.objects.filter(manufacturer_id=manufacturer_id)
+                     .annotate(part_count=Count('parts'))),
+        FACET_TIMEOUT,
+    )
+
+
+def model_detail_facets(car_model_id):
+    """차량 모델의 세부 차종 + 세부 차종별 부품 수"""
+    return cache.get_or_set(
+        _details_key(car_model_id),
+        lambda: list(CarModelDetail.objects.filter(model_id=car_model_id)
+                     .annotate(part_count=Count('parts'))),
+        FACET_TIMEOUT,
+    )
+
+
+def subcategory_facets(parent_category):
+    """대분류 카테고리의 세부 카테고리 + 세부 카테고리별 부품 수"""
+    return cache.get_or_set(
+        _subcategories_key(parent_category),
+        lambda: list(PartSubCategory.objects.filter(parent_category=parent_category)
+                     .annotate(part_count=Count('part'))),
+        FACET_TIMEOUT,
+    )
+
+
+def invalidate_part_facets(car_model_ids=(), car_model_detail_ids=(), subcategory_ids=()):
+    """부품이 속한(또는 속했던) 분류의 개수 캐시만 삭제"""
+    car_model_ids = {i for i in car_model_ids if i}
+    car_model_detail_ids = {i for i in car_model_detail_ids if i}
+    subcategory_ids = {i for i in subcategory_ids if i}
+
+    keys = []
+    if car_model_ids:
+        manufacturer_ids = CarModel.objects.filter(id__in=car_model_ids).values_list('manufacturer_id', flat=True)
+        keys += [_models_key(m) for m in set(manufacturer_ids)]
+    if car_model_detail_ids:
+        model_ids = CarModelDetail.objects.filter(id__in=car_model_detail_ids).values_list('model_id', flat=True)
+        keys += [_details_key(m) for m in set(model_ids)]
+    if subcategory_ids:
+        categories = PartSubCategory.objects.filter(id__in=subcategory_ids).values_list('parent_category', flat=True)
+        keys += [_subcategories_key(c) for c in set(categories)]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_manufacturer_facets(manufacturer_id):
+    cache.delete(_models_key(manufacturer_id))
+
+
+def invalidate_model_detail_facets(car_model_id):
+    cache.delete(_details_key(car_model_id))
+
+
+def invalidate_subcategory_facets():
+    cache.delete_many([_subcategories_key(c) for c in PartSubCategory.PartsCategory.values])
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from parts.models import Part
+from parts.utils import parse_year_range
+
+
+class Command(BaseCommand):
+    help = "applicable_years(연식 문자열)로 year_from/year_to를 일괄 갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--all", action="store_true", help="이미 값이 있는 부품도 다시 계산")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        parts = Part.objects.only("id", "applicable_years", "year_from", "year_to")
+        if not options["all"]:
+            parts = parts.filter(year_from__isnull=True)
+
+        batch, updated, unparsed = [], 0, 0
+        for part in parts.iterator(chunk_size=batch_size):
+            year_range = parse_year_range(part.applicable_years)
+            if year_range[0] is None:
+                unparsed += 1
+            if (part.year_from, part.year_to) == year_range:
+                continue
+            part.year_from, part.year_to = year_range
+            batch.append(part)
+            if len(batch) >= batch_size:
+                Part.objects.bulk_update(batch, ["year_from", "year_to"])
+                updated += len(batch)
+                batch = []
+        if batch:
+            Part.objects.bulk_update(batch, ["year_from", "year_to"])
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"연식 갱신 {updated}건, 해석 불가 {unparsed}건"))
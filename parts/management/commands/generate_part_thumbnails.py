@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from parts.models import PartImage
+
+
+class Command(BaseCommand):
+    help = "부품 사진의 목록/상세/확대용 축소본을 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="이미 생성된 사진도 다시 생성")
+
+    def handle(self, *args, **options):
+        images = PartImage.objects.exclude(image="").order_by("id")
+        if not options["force"]:
+            images = images.filter(variants_ready=False)
+
+        done, failed = 0, 0
+        for image in images.iterator(chunk_size=200):
+            if image.generate_variants():
+                done += 1
+            else:
+                failed += 1
+                self.stderr.write(f"실패: PartImage#{image.pk} {image.image.name}")
+
+        self.stdout.write(self.style.SUCCESS(f"축소본 생성 {done}건, 실패 {failed}건"))
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:12
+
+from django.db import migrations, models
+
+from parts.search import build_search_document, install_search_index, uninstall_search_index
+
+
+def fill_search_documents(apps, schema_editor):
+    Part = apps.get_model('parts', 'Part')
+    PartSubCategory = apps.get_model('parts', 'PartSubCategory')
+    category_labels = dict(PartSubCategory._meta.get_field('parent_category').choices)
+
+    parts = Part.objects.using(schema_editor.connection.alias)\
+                        .select_related('car_model__manufacturer', 'car_model_detail', 'subcategory')
+    batch = []
+    for part in parts.iterator(chunk_size=500):
+        car_model, sub = part.car_model, part.subcategory
+        part.search_document = build_search_document(
+            part.title,
+            part.part_number,
+            car_model.manufacturer.name if car_model else None,
+            car_model.name if car_model else None,
+            part.car_model_detail.name if part.car_model_detail else None,
+            sub.name if sub else None,
+            category_labels.get(sub.parent_category) if sub else None,
+        )
+        batch.append(part)
+    Part.objects.using(schema_editor.connection.alias).bulk_update(batch, ['search_document'], batch_size=500)
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor.connection, rebuild=True)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0008_part_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='part',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
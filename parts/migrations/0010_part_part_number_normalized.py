@@ -0,0 +1,31 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+from parts.search import normalize_part_number
+
+
+def fill_part_number_normalized(apps, schema_editor):
+    Part = apps.get_model('parts', 'Part')
+    parts = Part.objects.using(schema_editor.connection.alias).only('id', 'part_number')
+    batch = []
+    for part in parts.iterator(chunk_size=500):
+        part.part_number_normalized = normalize_part_number(part.part_number)
+        batch.append(part)
+    Part.objects.using(schema_editor.connection.alias).bulk_update(batch, ['part_number_normalized'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0009_part_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='part',
+            name='part_number_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=256),
+        ),
+        migrations.RunPython(fill_part_number_normalized, migrations.RunPython.noop),
+    ]
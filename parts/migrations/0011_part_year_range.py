@@ -0,0 +1,40 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+from parts.utils import parse_year_range
+
+
+def fill_year_range(apps, schema_editor):
+    Part = apps.get_model('parts', 'Part')
+    parts = Part.objects.using(schema_editor.connection.alias).only('id', 'applicable_years')
+    batch = []
+    for part in parts.iterator(chunk_size=500):
+        part.year_from, part.year_to = parse_year_range(part.applicable_years)
+        batch.append(part)
+    Part.objects.using(schema_editor.connection.alias).bulk_update(batch, ['year_from', 'year_to'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0010_part_part_number_normalized'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='part',
+            name='year_from',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='연식 시작'),
+        ),
+        migrations.AddField(
+            model_name='part',
+            name='year_to',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='연식 끝'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['car_model', 'year_from', 'year_to'], name='part_model_years_idx'),
+        ),
+        migrations.RunPython(fill_year_range, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:17
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_parent_category(apps, schema_editor):
+    Part = apps.get_model('parts', 'Part')
+    PartSubCategory = apps.get_model('parts', 'PartSubCategory')
+    parent = PartSubCategory.objects.filter(pk=OuterRef('subcategory_id')).values('parent_category')[:1]
+    Part.objects.using(schema_editor.connection.alias).update(parent_category=Coalesce(Subquery(parent), Value('')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0011_part_year_range'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='part',
+            name='parent_category',
+            field=models.CharField(blank=True, choices=[('front', '전면부품'), ('rear', '후면부품'), ('side', '측면부품'), ('interior', '실내부품'), ('wheel', '중고순정휠'), ('underbody', '하체부품'), ('etc', '기타부품')], default='', editable=False, max_length=20),
+        ),
+        migrations.RunPython(fill_parent_category, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['created_at', 'id'], name='part_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['price', 'id'], name='part_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['title', 'id'], name='part_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['car_model', 'created_at', 'id'], name='part_model_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['car_model', 'price', 'id'], name='part_model_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['car_model_detail', 'created_at', 'id'], name='part_detail_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['car_model_detail', 'price', 'id'], name='part_detail_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['subcategory', 'created_at', 'id'], name='part_sub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['subcategory', 'price', 'id'], name='part_sub_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['parent_category', 'created_at', 'id'], name='part_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['parent_category', 'price', 'id'], name='part_cat_price_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0012_part_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partimage',
+            name='variants_ready',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from parts.utils import parse_year_range
+
+
+def reparse_year_range(apps, schema_editor):
+    # "2015.03~2018.05"처럼 월이 붙은 연식이 (2003, 2015)로 잘못 저장된 경우 다시 계산
+    Part = apps.get_model('parts', 'Part')
+    parts = Part.objects.using(schema_editor.connection.alias).only('id', 'applicable_years', 'year_from', 'year_to')
+    batch = []
+    for part in parts.iterator(chunk_size=500):
+        year_range = parse_year_range(part.applicable_years)
+        if (part.year_from, part.year_to) != year_range:
+            part.year_from, part.year_to = year_range
+            batch.append(part)
+    Part.objects.using(schema_editor.connection.alias).bulk_update(batch, ['year_from', 'year_to'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0013_partimage_variants_ready'),
+    ]
+
+    operations = [
+        migrations.RunPython(reparse_year_range, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+from parts.search import build_bigram_document, install_search_index, uninstall_bigram_index
+
+
+def fill_search_bigrams(apps, schema_editor):
+    Part = apps.get_model('parts', 'Part')
+    parts = Part.objects.using(schema_editor.connection.alias).only('id', 'search_document')
+    batch = []
+    for part in parts.iterator(chunk_size=500):
+        part.search_bigrams = build_bigram_document(part.search_document)
+        batch.append(part)
+    Part.objects.using(schema_editor.connection.alias).bulk_update(batch, ['search_bigrams'], batch_size=500)
+
+
+def create_bigram_index(apps, schema_editor):
+    install_search_index(schema_editor.connection, rebuild=True)
+
+
+def drop_bigram_index(apps, schema_editor):
+    uninstall_bigram_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0014_reparse_year_range'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='part',
+            name='search_bigrams',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_bigrams, migrations.RunPython.noop),
+        migrations.RunPython(create_bigram_index, drop_bigram_index),
+    ]
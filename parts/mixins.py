@@ -0,0 +1,161 @@
+from django.conf import settings
+from django.core.paginator import PageNotAnInteger, EmptyPage
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+
+from .conditional import catalog_version, conditional_page, make_etag, taxonomy_version
+from .models import Part, PartImage
+from .pagination import CursorPaginator
+
+
+def format_prices(parts):
+    """부품마다 천 단위 콤마가 들어간 formatted_price를 붙임"""
+    for part in parts:
+        try:
+            part.formatted_price = "{:,.0f}".format(part.price)
+        except (ValueError, TypeError):
+            part.formatted_price = part.price
+    return parts
+
+
+class CatalogListMixin:
+    """
+    부품 목록 화면 공용 믹스인.
+    조회(select_related/첫 이미지만 prefetch/only), 검색, 정렬, 페이지 보정,
+    페이지 버튼 묶음 계산을 한 곳에서 처리한다.
+    각 화면은 filter_queryset()에서 자기 조건만 추가하면 된다.
+    카탈로그가 바뀌지 않았으면 조회/렌더링 없이 304로 응답한다 (parts.conditional).
+    """
+    model = Part
+    context_object_name = 'products'
+    paginate_by = 12
+    page_numbers_range = 5
+
+    # 허용된 정렬 키만 사용 (그 외 값은 기본 정렬)
+    sort_orderings = {
+        'new': ('-created_at', '-id'),
+        'low_price': ('price', 'id'),
+        'high_price': ('-price', '-id'),
+        'title': ('title', 'id'),
+    }
+    default_sort = 'new'
+
+    # 목록 템플릿에서 실제로 읽는 컬럼만 조회
+    list_fields = (
+        'id', 'title', 'price', 'created_at',
+        'car_model__id', 'car_model__name',
+        'car_model__manufacturer__id', 'car_model__manufacturer__name',
+        'subcategory__id', 'subcategory__name', 'subcategory__parent_category',
+    )
+
+    def dispatch(self, request, *args, **kwargs):
+        page = conditional_page(etag_func=self.get_etag, last_modified_func=self.get_last_modified)
+        return page(super().dispatch)(request, *args, **kwargs)
+
+    def get_etag(self, request, *args, **kwargs):
+        return make_etag(request, catalog_version(), taxonomy_version())
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return max(catalog_version(), taxonomy_version())
+
+    def use_cursor_pagination(self):
+        # 커서(keyset) 페이지네이션 사용 여부 (검색 관련도순일 때는 일반 페이지네이션)
+        enabled = getattr(settings, "CATALOG_CURSOR_PAGINATION", False)
+        return enabled and not (self.search_query and 'sort' not in self.request.GET)
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.use_cursor_pagination():
+            paginator = CursorPaginator(queryset, page_size, self.get_ordering(),
+                                        window=self.page_numbers_range,
+                                        count_timeout=getattr(settings, "CATALOG_COUNT_CACHE_TIMEOUT", 60))
+            page = paginator.page(self.request.GET.get("cursor"), self.request.GET.get("page"))
+            return (paginator, page, page.object_list, page.has_other_pages())
+
+        paginator = self.get_paginator(queryset, page_size)
+        raw = self.request.GET.get("page", 1)
+
+        # 숫자 보정: 1 미만이면 1로, 숫자 아님이면 1로
+        try:
+            number = int(raw)
+            if number < 1:
+                number = 1
+        except (TypeError, ValueError):
+            number = 1
+
+        # Django 내부 예외도 한 번 더 안전하게 처리
+        try:
+            page = paginator.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            page = paginator.page(1)
+
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_base_queryset(self):
+        # 목록에서는 대표 이미지 1장만 필요 → 부품당 첫 이미지만 prefetch
+        first_image = (PartImage.objects
+                       .annotate(image_rank=Window(RowNumber(), partition_by=F('part_id'), order_by=F('id').asc()))
+                       .filter(image_rank=1))
+        return (Part.objects
+                .select_related('car_model__manufacturer', 'subcategory')
+                .prefetch_related(Prefetch('images', queryset=first_image))
+                .only(*self.list_fields))
+
+    def filter_queryset(self, queryset):
+        """화면별 조건 (제조사/차종/카테고리 등)"""
+        return queryset
+
+    def get_year(self):
+        """?year= 연식 필터 (숫자가 아니거나 범위 밖이면 무시)"""
+        try:
+            year = int(self.request.GET.get('year', ''))
+        except ValueError:
+            return None
+        return year if 1900 <= year <= 2100 else None
+
+    def search_queryset(self, queryset):
+        self.search_query = self.request.GET.get('q', '').strip()
+        if self.search_query:
+            queryset = queryset.search(self.search_query)
+        return queryset
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort', self.default_sort)
+        return sort if sort in self.sort_orderings else self.default_sort
+
+    def get_ordering(self):
+        # 검색 중이고 정렬을 따로 고르지 않았으면 관련도순
+        if self.search_query and 'sort' not in self.request.GET:
+            return ('-search_rank',) + self.sort_orderings[self.default_sort]
+        return self.sort_orderings[self.get_sort()]
+
+    def get_queryset(self):
+        queryset = self.filter_queryset(self.get_base_queryset())
+        self.year = self.get_year()
+        if self.year:
+            queryset = queryset.fitting_year(self.year)
+        queryset = self.search_queryset(queryset)
+        return queryset.order_by(*self.get_ordering())
+
+    def get_page_range(self, paginator, page_obj):
+        window = self.page_numbers_range
+        start_page = ((page_obj.number - 1) // window) * window + 1
+        end_page = min(start_page + window - 1, paginator.num_pages)
+        return range(start_page, end_page + 1)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        # ✅ 페이지 버튼 묶음 계산은 page_obj.number로 (이미 보정된 값)
+        context['cursor_paginated'] = isinstance(context.get('paginator'), CursorPaginator)
+        if context['cursor_paginated']:
+            context['page_range'] = context['page_obj'].page_range
+        elif context.get('is_paginated'):
+            context['page_range'] = self.get_page_range(context['paginator'], context['page_obj'])
+        else:
+            context['page_range'] = []
+
+        # ✅ 가격 포맷은 현재 페이지에 보이는 부품에만 적용
+        format_prices(context['object_list'])
+        context['selected_sort'] = self.get_sort()
+        context['selected_year'] = self.year
+        return context
@@ -1,6 +1,12 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .conditional import bump_catalog_version
+from .utils import parse_year_range
+from .thumbnails import generate_variants, variant_url
+from .search import build_bigram_document, build_search_document, normalize_part_number, search_part_number, search_parts
+
 # Create your models here.
 class CarManufacturer(models.Model):
     """자동차 회사"""
@@ -62,6 +68,22 @@ class PartSubCategory(models.Model):
     def __str__(self):
         return f"{self.get_parent_category_display()} - {self.name}"
 
+class PartQuerySet(models.QuerySet):
+    def fitting_year(self, year):
+        """해당 연식 차량에 맞는 부품 (끝 연식이 없으면 현재까지)"""
+        return self.filter(
+            models.Q(year_from__lte=year),
+            models.Q(year_to__gte=year) | models.Q(year_to__isnull=True),
+        )
+
+    def search(self, q):
+        """전문검색 인덱스로 검색 (search_rank 클수록 관련도 높음)"""
+        return search_parts(self, q)
+
+    def by_part_number(self, q):
+        """품번 정확/앞부분 일치 (대시·공백 무시, 인덱스 조회)"""
+        return search_part_number(self, q)
+
 class Part(models.Model):
     title = models.CharField(max_length=200, verbose_name="제목")
 
@@ -76,10 +98,17 @@ class Part(models.Model):
     )
 
     part_number = models.CharField(max_length=256, verbose_name="제품번호")  # 품번
+    # 대문자 영숫자만 남긴 품번 (저장 시 자동 생성, 품번 검색용 인덱스)
+    part_number_normalized = models.CharField(max_length=256, blank=True, default="", db_index=True, editable=False)
     applicable_years = models.CharField(max_length=50, help_text="예: 2015-2018", verbose_name="연식")
+    # applicable_years를 해석한 연식 범위 (저장 시 자동 생성, 연식 필터용)
+    year_from = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name="연식 시작")
+    year_to = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name="연식 끝")
 
     # 카테고리
     subcategory = models.ForeignKey(PartSubCategory, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="부품 카테고리")
+    # subcategory.parent_category 복사본 (저장 시 자동 생성, 대분류 목록을 조인 없이 조회)
+    parent_category = models.CharField(max_length=20, choices=PartSubCategory.PartsCategory.choices, blank=True, default="", editable=False)
 
     stock = models.PositiveIntegerField(default=0, verbose_name="재고")
     price = models.DecimalField(max_digits=10, decimal_places=0, null=True, verbose_name="가격", help_text="0으로 입력 시 전화상담으로 표시")
@@ -87,22 +116,99 @@ class Part(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, editable=False)  # ✅ 등록 시 자동 저장
     updated_at = models.DateTimeField(auto_now=True)  # 저장될 때마다 자동 갱신
 
+    # 검색용 비정규화 문서 (저장 시 자동 생성)
+    search_document = models.TextField(blank=True, default="", editable=False)
+    # search_document의 단어별 두 글자 조각 (1~2글자 검색어용, 저장 시 자동 생성)
+    search_bigrams = models.TextField(blank=True, default="", editable=False)
+
+    objects = PartQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} ({self.part_number})"
 
     class Meta:
         verbose_name = "부품"
         verbose_name_plural = "부품 관리"
+        indexes = [
+            models.Index(fields=["car_model", "year_from", "year_to"], name="part_model_years_idx"),
+            # 목록 정렬 (신상품순/가격순/상품명순)
+            models.Index(fields=["created_at", "id"], name="part_created_idx"),
+            models.Index(fields=["price", "id"], name="part_price_idx"),
+            models.Index(fields=["title", "id"], name="part_title_idx"),
+            # 목록 필터 + 정렬
+            models.Index(fields=["car_model", "created_at", "id"], name="part_model_created_idx"),
+            models.Index(fields=["car_model", "price", "id"], name="part_model_price_idx"),
+            models.Index(fields=["car_model_detail", "created_at", "id"], name="part_detail_created_idx"),
+            models.Index(fields=["car_model_detail", "price", "id"], name="part_detail_price_idx"),
+            models.Index(fields=["subcategory", "created_at", "id"], name="part_sub_created_idx"),
+            models.Index(fields=["subcategory", "price", "id"], name="part_sub_price_idx"),
+            models.Index(fields=["parent_category", "created_at", "id"], name="part_cat_created_idx"),
+            models.Index(fields=["parent_category", "price", "id"], name="part_cat_price_idx"),
+        ]
+
+    # 이 FK들이 바뀌면 목록 개수 칩(facets)이 달라짐
+    FACET_FIELDS = ("car_model_id", "car_model_detail_id", "subcategory_id")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 불러올 때의 분류를 기억 (only()로 빠진 필드는 조회하지 않음)
+        instance._loaded_facets = {f: instance.__dict__.get(f) for f in cls.FACET_FIELDS}
+        # 관리자 화면의 재고 수정분을 재고 원장에 남기기 위함 (shop.signal)
+        instance._loaded_stock = instance.__dict__.get("stock")
+        return instance
+
+    # 이 필드가 바뀔 때만 검색 문서를 다시 만듦
+    SEARCH_SOURCE_FIELDS = {"title", "part_number", "car_model", "car_model_detail", "subcategory"}
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        derived = set()
+        if update_fields is None or "applicable_years" in update_fields:
+            self.year_from, self.year_to = parse_year_range(self.applicable_years)
+            derived |= {"year_from", "year_to"}
+        if update_fields is None or "subcategory" in update_fields:
+            self.parent_category = self.subcategory.parent_category if self.subcategory else ""
+            derived.add("parent_category")
+        if update_fields is None or self.SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            self.part_number_normalized = normalize_part_number(self.part_number)
+            self.search_document = self.build_search_document()
+            self.search_bigrams = build_bigram_document(self.search_document)
+            derived |= {"part_number_normalized", "search_document", "search_bigrams"}
+        if update_fields is not None and derived:
+            kwargs["update_fields"] = {*update_fields, *derived}
+        if (update_fields is None and not self._state.adding and not kwargs.get("force_insert")
+                and self.stock == getattr(self, "_loaded_stock", None)):
+            # 재고를 고치지 않은 저장은 stock을 쓰지 않음 (메모리 값이 주문 차감 전 값일 수 있음)
+            kwargs["update_fields"] = [f.name for f in self._meta.concrete_fields
+                                       if not f.primary_key and f.name != "stock"]
+        super().save(*args, **kwargs)
+
+    def build_search_document(self):
+        car_model = self.car_model
+        return build_search_document(
+            self.title,
+            self.part_number,
+            car_model.manufacturer.name if car_model else None,
+            car_model.name if car_model else None,
+            self.car_model_detail.name if self.car_model_detail else None,
+            self.subcategory.name if self.subcategory else None,
+            self.get_category_display(),
+        )
 
     def get_category_display(self):
         return self.subcategory.get_parent_category_display() if self.subcategory else None
 
     @property
     def main_image_url(self):
-        """첫 번째 이미지 URL (없으면 None)"""
-        first = self.images.first()
+        """첫 번째 이미지 목록용 축소본 URL (없으면 None)"""
+        if "images" in getattr(self, "_prefetched_objects_cache", {}):
+            # prefetch된 경우 추가 쿼리 없이 사용
+            first = min(self.images.all(), key=lambda image: image.pk, default=None)
+        else:
+            first = self.images.first()
         try:
-            return first.image.url if first and first.image else None
+            return first.thumb_url if first and first.image else None
         except Exception:
             return None
 
@@ -131,3 +237,62 @@ class PartImage(models.Model):
         return f"{instance.part.car_model.manufacturer.name}/{instance.part.car_model.name}/{instance.part.subcategory}/{filename}"
 
     image = models.ImageField(upload_to=image_upload_path)
+    # 축소본(목록/상세/확대) 생성 완료 여부
+    variants_ready = models.BooleanField(default=False, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = instance.__dict__.get("image")
+        return instance
+
+    def save(self, *args, **kwargs):
+        image_changed = str(self.image or "") != str(getattr(self, "_loaded_image", None) or "")
+        if image_changed:
+            self.variants_ready = False
+        super().save(*args, **kwargs)
+        touched = image_changed and self.image and self.generate_variants()
+        self._loaded_image = self.image.name
+        if not touched:
+            self.touch_part()
+
+    def generate_variants(self):
+        """업로드된 원본으로 축소본 생성 (실패해도 원본은 그대로 사용)"""
+        try:
+            generate_variants(self.image)
+        except (OSError, ValueError):
+            return False
+        self.variants_ready = True
+        PartImage.objects.filter(pk=self.pk).update(variants_ready=True)
+        self.touch_part()
+        return True
+
+    def touch_part(self):
+        """사진이 바뀌면 부품 updated_at과 카탈로그 버전 갱신 (상세/목록 ETag, 상세 조각 캐시)"""
+        Part.objects.filter(pk=self.part_id).update(updated_at=timezone.now())
+        bump_catalog_version()
+
+    def _url(self, size, ext):
+        if self.variants_ready:
+            return variant_url(self.image, size, ext)
+        return self.image.url
+
+    @property
+    def thumb_url(self):
+        return self._url("thumb", "jpg")
+
+    @property
+    def thumb_webp_url(self):
+        return self._url("thumb", "webp")
+
+    @property
+    def detail_url(self):
+        return self._url("detail", "jpg")
+
+    @property
+    def detail_webp_url(self):
+        return self._url("detail", "webp")
+
+    @property
+    def zoom_url(self):
+        return self._url("zoom", "jpg")
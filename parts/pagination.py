@@ -0,0 +1,193 @@
+"""
+부품 목록용 커서(keyset) 페이지네이션.
+
+OFFSET 대신 "마지막으로 본 정렬 키 이후" 조건으로 조회하므로 몇 번째 페이지든 비용이 같다.
+페이지 버튼 묶음(기본 5페이지) 단위로 커서를 잡고, 묶음 안에서는 page 번호로 이동한다.
+전체 개수는 COUNT를 캐시해서 보여준다.
+"""
+import base64
+import hashlib
+import json
+import math
+
+from django.core.cache import cache
+from django.db.models import F, Q
+
+
+def _encode(data):
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class CursorPaginator:
+    """
+    ordering: ('-created_at', '-id') 처럼 마지막이 유일 키(id)인 정렬.
+    NULL은 가장 작은 값으로 취급한다 (오름차순 맨 앞, 내림차순 맨 뒤).
+    """
+
+    def __init__(self, queryset, per_page, ordering, window=5, count_timeout=60):
+        self.per_page = per_page
+        self.window = window
+        self.count_timeout = count_timeout
+        self.keys = [(f.lstrip("-"), f.startswith("-")) for f in ordering]
+        self.key_fields = [name for name, _ in self.keys]
+        # DB마다 다른 NULL 정렬 위치를 고정
+        self.queryset = queryset.order_by(*self._order_by())
+
+    # ── 정렬/조건 ──
+    def _order_by(self, reverse=False):
+        exprs = []
+        for name, desc in self.keys:
+            if desc != reverse:
+                exprs.append(F(name).desc(nulls_last=True))
+            else:
+                exprs.append(F(name).asc(nulls_first=True))
+        return exprs
+
+    def _after(self, values, reverse=False):
+        """정렬상 values 바로 다음부터의 행 조건"""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, desc), value in zip(self.keys, values):
+            if desc != reverse:
+                if value is None:
+                    beyond = Q(pk__in=[])
+                else:
+                    beyond = Q(**{f"{name}__lt": value}) | Q(**{f"{name}__isnull": True})
+            else:
+                beyond = Q(**{f"{name}__isnull": False}) if value is None else Q(**{f"{name}__gt": value})
+            condition |= equal & beyond
+            equal &= Q(**{f"{name}__isnull": True}) if value is None else Q(**{name: value})
+        return condition
+
+    def _to_python(self, values):
+        model = self.queryset.model
+        return [model._meta.get_field(name).to_python(v) if v is not None else None
+                for name, v in zip(self.key_fields, values)]
+
+    # ── 개수 (캐시) ──
+    @property
+    def count(self):
+        if not hasattr(self, "_count"):
+            sql, params = self.queryset.query.sql_with_params()
+            key = "parts:count:" + hashlib.md5(f"{sql}{params!r}".encode()).hexdigest()
+            self._count = cache.get_or_set(key, self.queryset.count, self.count_timeout)
+        return self._count
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.per_page))
+
+    # ── 페이지 ──
+    def page(self, token, number=None):
+        cursor = _decode(token) if token else None
+        window_rows = self.window * self.per_page
+        window_no, backwards = 0, False
+
+        keys_qs = self.queryset.values_list(*self.key_fields)
+        if cursor and isinstance(cursor.get("k"), list) and len(cursor["k"]) == len(self.keys):
+            try:
+                values = self._to_python(cursor["k"])
+                window_no = max(0, int(cursor.get("w", 0)))
+            except Exception:
+                values, window_no = None, 0
+            if values is not None:
+                backwards = cursor.get("d") == "prev"
+                keys_qs = keys_qs.filter(self._after(values, reverse=backwards))
+                keys_qs = keys_qs.order_by(*self._order_by(reverse=backwards))
+
+        rows = list(keys_qs[:window_rows + 1])
+        if backwards:
+            has_more = len(rows) > window_rows
+            rows = list(reversed(rows[:window_rows]))
+            has_next_window = True
+            if not has_more:
+                # 앞쪽 끝에 도달 → 첫 묶음으로 보정
+                window_no = 0
+                rows = list(self.queryset.values_list(*self.key_fields)[:window_rows + 1])
+                has_next_window = len(rows) > window_rows
+                rows = rows[:window_rows]
+        else:
+            has_next_window = len(rows) > window_rows
+            rows = rows[:window_rows]
+
+        pages_in_window = max(1, math.ceil(len(rows) / self.per_page))
+        first_number = window_no * self.window + 1
+        try:
+            index = int(number) - first_number if number else None
+        except (TypeError, ValueError):
+            index = None
+        if index is None:
+            index = pages_in_window - 1 if backwards else 0
+        index = min(max(index, 0), pages_in_window - 1)
+
+        page_rows = rows[index * self.per_page:(index + 1) * self.per_page]
+        ids = [row[-1] for row in page_rows]
+        object_list = self.queryset.filter(pk__in=ids) if ids else self.queryset.none()
+
+        return CursorPage(
+            paginator=self,
+            object_list=object_list,
+            number=first_number + index,
+            first_number=first_number,
+            pages_in_window=pages_in_window,
+            prev_cursor=_encode({"k": rows[0], "w": window_no - 1, "d": "prev"}) if window_no > 0 and rows else None,
+            next_cursor=_encode({"k": rows[-1], "w": window_no + 1}) if has_next_window else None,
+            has_next_window=has_next_window,
+        )
+
+
+class CursorPage:
+    def __init__(self, paginator, object_list, number, first_number, pages_in_window,
+                 prev_cursor, next_cursor, has_next_window):
+        self.paginator = paginator
+        self.object_list = object_list
+        self.number = number
+        self.first_number = first_number
+        self.last_number = first_number + pages_in_window - 1
+        self.prev_cursor = prev_cursor
+        self.next_cursor = next_cursor
+        self.has_next_window = has_next_window
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def page_range(self):
+        return range(self.first_number, self.last_number + 1)
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_next(self):
+        return self.number < self.last_number or self.has_next_window
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def previous_page_number(self):
+        return self.number - 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+    @property
+    def previous_in_window(self):
+        """이전 페이지가 현재 묶음 안에 있는지 (아니면 prev_cursor로 이동)"""
+        return self.number > self.first_number
+
+    @property
+    def next_in_window(self):
+        return self.number < self.last_number
@@ -0,0 +1,270 @@
+"""
+부품 검색 인덱스.
+
+Part.search_document(제목/품번/제조사/차종/세부차종/카테고리를 합친 문자열)를
+DB별 전문검색 인덱스로 조회한다.
+  - SQLite     : FTS5(trigram) 가상 테이블 + 트리거로 parts_part와 동기화
+                 1~2글자 검색어(범퍼, 도어, 휠 …)는 trigram으로 못 찾으므로
+                 search_bigrams(단어별 두 글자 조각)를 unicode61 FTS5 테이블로 따로 색인
+  - PostgreSQL : to_tsvector GIN 인덱스 + pg_trgm 인덱스
+  - 그 외      : search_document 단일 컬럼 icontains
+"""
+import re
+
+from django.db import connections
+from django.db.models import Case, Q, Value, When, FloatField
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "parts_part_fts"
+BIGRAM_FTS_TABLE = "parts_part_fts_bigram"
+
+# trigram 토크나이저는 3글자 미만 검색어를 찾지 못하므로 짧은 단어는 두 글자 조각 색인으로 처리
+MIN_FTS_TERM_LENGTH = 3
+WORD_RE = re.compile(r"\w+")
+
+SQLITE_FTS_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        search_document, content='parts_part', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS parts_part_fts_ai AFTER INSERT ON parts_part BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS parts_part_fts_ad AFTER DELETE ON parts_part BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS parts_part_fts_au AFTER UPDATE OF search_document ON parts_part BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+        INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+    END""",
+]
+
+# 단어마다 두 글자 조각 + 마지막 글자를 토큰으로 (build_bigram_document)
+SQLITE_BIGRAM_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {BIGRAM_FTS_TABLE} USING fts5(
+        search_bigrams, content='parts_part', content_rowid='id', tokenize='unicode61', prefix='1'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS parts_part_fts_bigram_ai AFTER INSERT ON parts_part BEGIN
+        INSERT INTO {BIGRAM_FTS_TABLE}(rowid, search_bigrams) VALUES (new.id, new.search_bigrams);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS parts_part_fts_bigram_ad AFTER DELETE ON parts_part BEGIN
+        INSERT INTO {BIGRAM_FTS_TABLE}({BIGRAM_FTS_TABLE}, rowid, search_bigrams)
+        VALUES ('delete', old.id, old.search_bigrams);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS parts_part_fts_bigram_au AFTER UPDATE OF search_bigrams ON parts_part BEGIN
+        INSERT INTO {BIGRAM_FTS_TABLE}({BIGRAM_FTS_TABLE}, rowid, search_bigrams)
+        VALUES ('delete', old.id, old.search_bigrams);
+        INSERT INTO {BIGRAM_FTS_TABLE}(rowid, search_bigrams) VALUES (new.id, new.search_bigrams);
+    END""",
+]
+
+SQLITE_BIGRAM_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS parts_part_fts_bigram_ai",
+    "DROP TRIGGER IF EXISTS parts_part_fts_bigram_ad",
+    "DROP TRIGGER IF EXISTS parts_part_fts_bigram_au",
+    f"DROP TABLE IF EXISTS {BIGRAM_FTS_TABLE}",
+]
+
+SQLITE_DROP_SQL = SQLITE_BIGRAM_DROP_SQL + [
+    "DROP TRIGGER IF EXISTS parts_part_fts_ai",
+    "DROP TRIGGER IF EXISTS parts_part_fts_ad",
+    "DROP TRIGGER IF EXISTS parts_part_fts_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# SearchVector('search_document', config='simple')가 만드는 식과 동일해야 인덱스를 탄다
+POSTGRES_INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE INDEX IF NOT EXISTS parts_part_search_tsv
+        ON parts_part USING GIN (to_tsvector('simple'::regconfig, COALESCE(search_document, '')))""",
+    """CREATE INDEX IF NOT EXISTS parts_part_search_trgm
+        ON parts_part USING GIN (UPPER(search_document) gin_trgm_ops)""",
+]
+
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS parts_part_search_tsv",
+    "DROP INDEX IF EXISTS parts_part_search_trgm",
+]
+
+_fts_ready = {}
+
+# 품번처럼 보이는 검색어 (영문/숫자/구분기호만, 숫자 포함, 4자 이상)
+PART_NUMBER_QUERY_RE = re.compile(r"^[0-9A-Za-z\s\-_./]+$")
+MIN_PART_NUMBER_LENGTH = 4
+
+
+def normalize_part_number(value):
+    """품번 정규화: 86511-2s 000 → 865112S000"""
+    return re.sub(r"[^0-9A-Z]", "", (value or "").upper())
+
+
+def build_search_document(*values):
+    """검색 대상 문자열들을 공백으로 이어 하나의 문서로 만듦"""
+    return " ".join(str(v).strip() for v in values if v)
+
+
+def build_bigram_document(document):
+    """
+    짧은 검색어용 색인 문자열: 단어마다 두 글자 조각과 마지막 글자.
+    "앞범퍼 도어" → "앞범 범퍼 퍼 도어 어"
+      - 두 글자 검색어는 조각과 정확히 일치 ("범퍼")
+      - 한 글자 검색어는 조각의 앞글자 일치 ("휠*", 단어 끝 글자는 마지막 글자 토큰으로)
+    """
+    tokens = []
+    for word in WORD_RE.findall((document or "").lower()):
+        tokens += [word[i:i + 2] for i in range(len(word) - 1)]
+        tokens.append(word[-1])
+    return " ".join(tokens)
+
+
+def install_search_index(connection, rebuild=False):
+    """
+    DB에 검색 인덱스를 만든다 (이미 있으면 건너뜀).
+    SQLite는 테이블 재생성(ALTER) 시 트리거가 사라지므로 migrate 후마다 다시 호출한다.
+    두 글자 조각 색인은 search_bigrams 컬럼이 생긴 뒤(0015 마이그레이션)부터 만든다.
+    """
+    if connection.vendor == "sqlite":
+        from django.db.utils import OperationalError
+
+        try:
+            with connection.cursor() as cursor:
+                columns = {c.name for c in connection.introspection.get_table_description(cursor, "parts_part")}
+                tables = [(FTS_TABLE, SQLITE_FTS_SQL)]
+                if "search_bigrams" in columns:
+                    tables.append((BIGRAM_FTS_TABLE, SQLITE_BIGRAM_SQL))
+                for table, statements in tables:
+                    for sql in statements:
+                        cursor.execute(sql)
+                    if rebuild:
+                        cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        except OperationalError:
+            # FTS5/trigram 미지원 SQLite → icontains로 대체
+            _fts_ready[connection.alias] = frozenset()
+            return False
+        _fts_ready[connection.alias] = frozenset(table for table, _ in tables)
+        return True
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            for sql in POSTGRES_INDEX_SQL:
+                cursor.execute(sql)
+        return True
+
+    return False
+
+
+def uninstall_search_index(connection):
+    statements = {
+        "sqlite": SQLITE_DROP_SQL,
+        "postgresql": POSTGRES_DROP_SQL,
+    }.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+    _fts_ready.pop(connection.alias, None)
+
+
+def uninstall_bigram_index(connection):
+    """두 글자 조각 색인만 지움 (search_bigrams 컬럼을 되돌릴 때)"""
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            for sql in SQLITE_BIGRAM_DROP_SQL:
+                cursor.execute(sql)
+    _fts_ready.pop(connection.alias, None)
+
+
+def fts_available(connection, table=FTS_TABLE):
+    if connection.alias not in _fts_ready:
+        existing = set(connection.introspection.table_names())
+        _fts_ready[connection.alias] = frozenset(t for t in (FTS_TABLE, BIGRAM_FTS_TABLE) if t in existing)
+    return table in _fts_ready[connection.alias]
+
+
+def _fts_phrase(term):
+    return '"%s"' % term.replace('"', '""')
+
+
+def search_part_number(queryset, q):
+    """
+    정규화 품번의 정확 일치(2점)/앞부분 일치(1점) 부품.
+    품번처럼 보이지 않는 검색어면 빈 queryset.
+    """
+    normalized = normalize_part_number(q)
+    if (not PART_NUMBER_QUERY_RE.match(q) or len(normalized) < MIN_PART_NUMBER_LENGTH
+            or not any(c.isdigit() for c in normalized)):
+        return queryset.none()
+
+    if connections[queryset.db].vendor == "sqlite":
+        # SQLite의 LIKE ... ESCAPE는 인덱스를 못 타므로 범위 조건으로 앞부분 일치
+        # (정규화 값은 0-9A-Z뿐이라 '['가 항상 더 큼)
+        prefix = Q(part_number_normalized__gte=normalized, part_number_normalized__lt=normalized + "[")
+    else:
+        prefix = Q(part_number_normalized__startswith=normalized)
+
+    return queryset.filter(prefix).annotate(search_rank=Case(
+        When(part_number_normalized=normalized, then=Value(2.0)),
+        default=Value(1.0),
+        output_field=FloatField(),
+    ))
+
+
+def search_parts(queryset, q):
+    """
+    품번 일치가 있으면 그것만, 없으면 검색어의 모든 단어를 포함하는 부품을
+    관련도(search_rank, 클수록 관련)와 함께 돌려준다.
+    """
+    terms = q.split()
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    by_part_number = search_part_number(queryset, q)
+    if by_part_number.exists():
+        return by_part_number
+
+    connection = connections[queryset.db]
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector("search_document", config="simple")
+        query = SearchQuery(q, config="simple", search_type="websearch")
+        term_filter = Q()
+        for term in terms:
+            term_filter &= Q(search_document__icontains=term)
+        return (queryset
+                .annotate(search_vector=vector, search_rank=SearchRank(vector, query))
+                .filter(Q(search_vector=query) | term_filter))
+
+    if connection.vendor != "sqlite" or not fts_available(connection):
+        for term in terms:
+            queryset = queryset.filter(search_document__icontains=term)
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    # 긴 단어는 trigram 색인, 1~2글자 단어는 두 글자 조각 색인 (문장부호가 섞였거나 색인이 없으면 LIKE)
+    long_terms, short_terms = [], []
+    for term in terms:
+        if len(term) >= MIN_FTS_TERM_LENGTH:
+            long_terms.append(_fts_phrase(term))
+        elif WORD_RE.fullmatch(term) and fts_available(connection, BIGRAM_FTS_TABLE):
+            short_terms.append(_fts_phrase(term.lower()) if len(term) == 2 else _fts_phrase(term.lower()) + "*")
+        else:
+            queryset = queryset.filter(search_document__icontains=term)
+
+    table = queryset.model._meta.db_table
+    rank = None
+    for fts_table, phrases in ((FTS_TABLE, long_terms), (BIGRAM_FTS_TABLE, short_terms)):
+        if not phrases:
+            continue
+        match = " ".join(phrases)
+        queryset = queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s", (match,))
+        )
+        score = RawSQL(
+            f'SELECT -bm25({fts_table}) FROM {fts_table} '
+            f'WHERE {fts_table} MATCH %s AND rowid = "{table}"."id"',
+            (match,),
+            output_field=FloatField(),
+        )
+        rank = score if rank is None else rank + score
+    if rank is None:
+        rank = Value(0.0, output_field=FloatField())
+    return queryset.annotate(search_rank=rank)
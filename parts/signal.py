@@ -0,0 +1,127 @@
+from django.db.models.signals import post_save, pre_delete, post_delete, post_migrate
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Part, PartImage, CarManufacturer, CarModel, CarModelDetail, PartSubCategory
+from .conditional import bump_catalog_version, bump_taxonomy_version
+from .search import build_bigram_document, install_search_index
+from .context_processor import invalidate_manufacturer_menu
+from .facets import (
+    invalidate_part_facets, invalidate_manufacturer_facets,
+    invalidate_model_detail_facets, invalidate_subcategory_facets,
+)
+
+
+def refresh_search_documents(queryset, batch_size=500):
+    """연관 이름(제조사/차종/카테고리)이 바뀐 부품들의 검색 문서를 일괄 갱신"""
+    # 상세 화면에 보이는 이름도 바뀐 것이므로 updated_at도 함께 갱신 (상세 ETag/조각 캐시)
+    parts = queryset.select_related("car_model__manufacturer", "car_model_detail", "subcategory")
+    now = timezone.now()
+    batch = []
+    for part in parts.iterator(chunk_size=batch_size):
+        part.search_document = part.build_search_document()
+        part.search_bigrams = build_bigram_document(part.search_document)
+        part.updated_at = now
+        batch.append(part)
+        if len(batch) >= batch_size:
+            Part.objects.bulk_update(batch, ["search_document", "search_bigrams", "updated_at"])
+            batch = []
+    if batch:
+        Part.objects.bulk_update(batch, ["search_document", "search_bigrams", "updated_at"])
+
+
+@receiver(post_save, sender=CarManufacturer)
+def _refresh_manufacturer_parts(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(Part.objects.filter(car_model__manufacturer=instance))
+
+@receiver(post_save, sender=CarModel)
+def _refresh_model_parts(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(Part.objects.filter(car_model=instance))
+
+@receiver(post_save, sender=CarModelDetail)
+def _refresh_model_detail_parts(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(Part.objects.filter(car_model_detail=instance))
+
+@receiver(post_save, sender=PartSubCategory)
+def _refresh_subcategory_parts(sender, instance, created, **kwargs):
+    if not created:
+        parts = Part.objects.filter(subcategory=instance)
+        parts.exclude(parent_category=instance.parent_category).update(parent_category=instance.parent_category)
+        refresh_search_documents(parts)
+
+@receiver(pre_delete, sender=PartSubCategory)
+def _clear_parent_category(sender, instance, **kwargs):
+    # SET_NULL은 Part.save()를 거치지 않으므로 복사본(parent_category)도 여기서 비움
+    # (개수 칩/카탈로그 버전은 post_delete 수신기에서 갱신)
+    Part.objects.filter(subcategory=instance).update(parent_category="", updated_at=timezone.now())
+
+@receiver(post_save, sender=CarManufacturer)
+@receiver(post_delete, sender=CarManufacturer)
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+def _invalidate_manufacturer_menu(sender, **kwargs):
+    invalidate_manufacturer_menu()
+
+@receiver(post_save, sender=Part)
+def _invalidate_facets_on_part_save(sender, instance, created, **kwargs):
+    loaded = getattr(instance, "_loaded_facets", {})
+    current = {f: getattr(instance, f) for f in Part.FACET_FIELDS}
+    if created or loaded != current:
+        invalidate_part_facets(
+            car_model_ids=[loaded.get("car_model_id"), current["car_model_id"]],
+            car_model_detail_ids=[loaded.get("car_model_detail_id"), current["car_model_detail_id"]],
+            subcategory_ids=[loaded.get("subcategory_id"), current["subcategory_id"]],
+        )
+    instance._loaded_facets = current
+
+@receiver(post_delete, sender=Part)
+def _invalidate_facets_on_part_delete(sender, instance, **kwargs):
+    invalidate_part_facets(
+        car_model_ids=[instance.car_model_id],
+        car_model_detail_ids=[instance.car_model_detail_id],
+        subcategory_ids=[instance.subcategory_id],
+    )
+
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+def _invalidate_model_facets(sender, instance, **kwargs):
+    invalidate_manufacturer_facets(instance.manufacturer_id)
+
+@receiver(post_save, sender=CarModelDetail)
+@receiver(post_delete, sender=CarModelDetail)
+def _invalidate_detail_facets(sender, instance, **kwargs):
+    invalidate_model_detail_facets(instance.model_id)
+
+@receiver(post_save, sender=PartSubCategory)
+@receiver(post_delete, sender=PartSubCategory)
+def _invalidate_subcategory_facets(sender, instance, **kwargs):
+    invalidate_subcategory_facets()
+
+@receiver(post_save, sender=Part)
+@receiver(post_delete, sender=Part)
+def _bump_catalog_version(sender, **kwargs):
+    bump_catalog_version()
+
+@receiver(post_delete, sender=PartImage)
+def _touch_part_on_image_delete(sender, instance, **kwargs):
+    instance.touch_part()
+
+@receiver(post_save, sender=CarManufacturer)
+@receiver(post_delete, sender=CarManufacturer)
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+@receiver(post_save, sender=CarModelDetail)
+@receiver(post_delete, sender=CarModelDetail)
+@receiver(post_save, sender=PartSubCategory)
+@receiver(post_delete, sender=PartSubCategory)
+def _bump_taxonomy_version(sender, **kwargs):
+    bump_taxonomy_version()
+
+@receiver(post_migrate)
+def _ensure_search_index(sender, using, **kwargs):
+    # SQLite는 테이블 재생성 시 FTS 트리거가 지워지므로 migrate 후 다시 확인
+    if sender.name == "parts":
+        from django.db import connections
+        install_search_index(connections[using])
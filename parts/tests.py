@@ -1,3 +1,551 @@
-from django.test import TestCase
+import re
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import skipUnless
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import CarManufacturer, CarModel, CarModelDetail, PartSubCategory, Part, PartImage
+from .pagination import CursorPaginator, _encode
+from .search import BIGRAM_FTS_TABLE, FTS_TABLE, build_bigram_document
+from .utils import parse_year_range
 
 # Create your tests here.
+FULL_SCAN_RE = re.compile(r"\bSCAN (TABLE )?parts_part\b(?! USING)")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+class ListingQueryPlanTest(TestCase):
+    """부품 목록 쿼리가 parts_part 전체 스캔으로 떨어지지 않는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manufacturer = CarManufacturer.objects.create(name="현대")
+        cls.car_model = CarModel.objects.create(manufacturer=cls.manufacturer, name="아반떼")
+        cls.detail = CarModelDetail.objects.create(model=cls.car_model, name="AD")
+        cls.subcategory = PartSubCategory.objects.create(parent_category="front", name="범퍼")
+        for i in range(30):
+            part = Part.objects.create(
+                title=f"앞범퍼 {i}", car_model=cls.car_model, car_model_detail=cls.detail,
+                subcategory=cls.subcategory, part_number=f"86511-2S{i:03d}",
+                applicable_years="2015-2018", price=10000 + i,
+            )
+            PartImage.objects.create(part=part, image=f"parts/{i}.jpg")
+
+    def listing_urls(self):
+        urls = [
+            reverse("parts:product_list"),
+            reverse("parts:product_by_category", args=["front"]),
+            reverse("parts:product_by_model", args=[self.car_model.id]),
+            reverse("parts:product_by_model_detail", args=[self.detail.id]),
+            reverse("parts:product_by_subcategory", args=[self.subcategory.id]),
+        ]
+        sorts = ["new", "low_price", "high_price"]
+        return [f"{url}?sort={sort}" for url in urls for sort in sorts]
+
+    def test_listing_queries_use_indexes(self):
+        for url in self.listing_urls():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+
+            for query in ctx.captured_queries:
+                sql = query["sql"]
+                if "parts_part" not in sql or not sql.startswith("SELECT"):
+                    continue
+                with connection.cursor() as cursor:
+                    cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                    plan = "\n".join(row[-1] for row in cursor.fetchall())
+                self.assertIsNone(FULL_SCAN_RE.search(plan), f"{url}\n{sql}\n{plan}")
+
+
+class CursorPaginatorTest(TestCase):
+    """커서 페이지네이션: 묶음 앞/뒤 이동, 가격 NULL 정렬, 잘못된 커서"""
+
+    @classmethod
+    def setUpTestData(cls):
+        car_model = CarModel.objects.create(manufacturer=CarManufacturer.objects.create(name="현대"), name="쏘나타")
+        # 가격이 같은 부품(동순위)과 가격 없는 부품(NULL)을 섞음
+        cls.parts = [
+            Part.objects.create(title=f"부품 {i:02d}", car_model=car_model,
+                                price=None if i % 4 == 0 else 1000 * (i % 5))
+            for i in range(20)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def paginator(self, ordering):
+        return CursorPaginator(Part.objects.all(), 3, ordering, window=2)
+
+    def expected(self, ordering):
+        # NULL은 가장 작은 값 (오름차순 맨 앞, 내림차순 맨 뒤)
+        def key(part):
+            return [(part.price is not None, part.price or 0), part.id]
+        return [p.id for p in sorted(self.parts, key=key, reverse=ordering[0].startswith("-"))]
+
+    def ids(self, page):
+        return list(page.object_list.values_list("id", flat=True))
+
+    def walk_forward(self, paginator):
+        """첫 묶음부터 next_cursor로 끝까지 → (모든 id, 묶음별 커서)"""
+        found, tokens, token = [], [], None
+        while True:
+            tokens.append(token)
+            page = paginator.page(token)
+            for number in page.page_range:
+                found += self.ids(paginator.page(token, number))
+            if not page.next_cursor:
+                return found, tokens
+            token = page.next_cursor
+
+    def test_forward_windows(self):
+        paginator = self.paginator(('-created_at', '-id'))
+        found, tokens = self.walk_forward(paginator)
+        self.assertEqual(found, [p.id for p in reversed(self.parts)])
+        self.assertEqual(len(tokens), 4)  # 20개 / (3개 x 2페이지)
+        self.assertEqual(paginator.count, 20)
+        self.assertEqual(paginator.num_pages, 7)
+
+        last = paginator.page(tokens[-1])
+        self.assertEqual((last.number, last.last_number), (7, 7))
+        self.assertFalse(last.has_next())
+
+    def test_backward_windows(self):
+        paginator = self.paginator(('-created_at', '-id'))
+        _, tokens = self.walk_forward(paginator)
+        page = paginator.page(tokens[-1])
+        # 뒤 묶음에서 prev_cursor → 앞 묶음의 마지막 페이지
+        for window in range(len(tokens) - 2, -1, -1):
+            page = paginator.page(page.prev_cursor)
+            forward = paginator.page(tokens[window], window * 2 + 2)
+            self.assertEqual(page.number, window * 2 + 2)
+            self.assertEqual(self.ids(page), self.ids(forward))
+        self.assertIsNone(page.prev_cursor)
+        self.assertEqual(page.first_number, 1)
+
+    def test_null_prices(self):
+        for ordering in (('price', 'id'), ('-price', '-id')):
+            with self.subTest(ordering=ordering):
+                found, _ = self.walk_forward(self.paginator(ordering))
+                self.assertEqual(found, self.expected(ordering))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = self.paginator(('price', 'id'))
+        first = self.ids(paginator.page(None))
+        tokens = [
+            "not-a-cursor!!",
+            _encode(["k", 1]),
+            _encode({"k": [1000]}),                # 키 개수가 다름
+            _encode({"k": ["abc", 1], "w": 1}),   # 가격 자리에 문자열
+            _encode({"k": [1000, 5], "w": "x"}),  # 묶음 번호가 숫자가 아님
+        ]
+        for token in tokens:
+            with self.subTest(token=token):
+                page = paginator.page(token)
+                self.assertEqual(page.number, 1)
+                self.assertEqual(self.ids(page), first)
+        # 범위 밖 page 번호는 묶음 안으로 보정
+        self.assertEqual(paginator.page(None, "99").number, 2)
+        self.assertEqual(paginator.page(None, "abc").number, 1)
+
+    @override_settings(CATALOG_CURSOR_PAGINATION=True)
+    def test_listing_reads_setting_per_request(self):
+        url = reverse("parts:product_list")
+        response = self.client.get(url)
+        self.assertTrue(response.context["cursor_paginated"])
+        with self.settings(CATALOG_CURSOR_PAGINATION=False):
+            cache.clear()
+            self.assertFalse(self.client.get(url).context["cursor_paginated"])
+
+
+class PartImageVariantTest(TestCase):
+    """업로드 시 목록/상세/확대 축소본이 원본 옆에 생성되는지 확인"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        manufacturer = CarManufacturer.objects.create(name="기아")
+        car_model = CarModel.objects.create(manufacturer=manufacturer, name="K5")
+        self.part = Part.objects.create(title="헤드램프", car_model=car_model)
+
+    def upload(self, size=(2000, 1500)):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", size, (200, 30, 30)).save(buffer, "JPEG")
+        return SimpleUploadedFile("lamp.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+    def test_variants_generated_on_upload(self):
+        from PIL import Image
+
+        image = PartImage.objects.create(part=self.part, image=self.upload())
+        image.refresh_from_db()
+        self.assertTrue(image.variants_ready)
+
+        storage = image.image.storage
+        for size, box in (("thumb", (260, 260)), ("detail", (700, 525)), ("zoom", (1600, 1200))):
+            for ext in ("jpg", "webp"):
+                name = image.image.name.rsplit(".", 1)[0] + f".{size}.{ext}"
+                self.assertTrue(storage.exists(name), name)
+                with storage.open(name) as f:
+                    width, height = Image.open(f).size
+                self.assertLessEqual(width, box[0])
+                self.assertLessEqual(height, box[1])
+        self.assertTrue(image.thumb_url.endswith(".thumb.jpg"))
+        self.assertTrue(image.detail_webp_url.endswith(".detail.webp"))
+
+    def test_missing_file_falls_back_to_original(self):
+        image = PartImage.objects.create(part=self.part, image="parts/missing.jpg")
+        self.assertFalse(image.variants_ready)
+        self.assertEqual(image.thumb_url, image.image.url)
+
+
+class ConditionalPageTest(TestCase):
+    """상세/목록의 ETag·Last-Modified → 304, 상세 조각 캐시와 자동 무효화"""
+
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = CarManufacturer.objects.create(name="현대")
+        cls.car_model = CarModel.objects.create(manufacturer=manufacturer, name="쏘나타")
+        cls.part = Part.objects.create(title="헤드램프", car_model=cls.car_model, price=50000, stock=3)
+        PartImage.objects.create(part=cls.part, image="parts/missing.jpg")
+
+    def setUp(self):
+        cache.clear()
+        self.detail_url = reverse("parts:product_detail", args=[self.part.id])
+        self.list_url = reverse("parts:product_by_model", args=[self.car_model.id])
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def visit_detail(self):
+        # 첫 방문은 CSRF 쿠키만 받고 검증자 없이 응답
+        response = self.client.get(self.detail_url)
+        self.assertFalse(response.has_header("ETag"))
+        return self.client.get(self.detail_url)
+
+    def test_detail_not_modified(self):
+        first = self.visit_detail()
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("no-cache", first["Cache-Control"])
+        self.assertIn("private", first["Cache-Control"])
+        self.assertTrue(first.has_header("Last-Modified"))
+
+        with self.assertNumQueries(1):
+            second = self.revalidate(self.detail_url, first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+        since = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(since.status_code, 304)
+
+    def test_detail_fragment_cached(self):
+        self.visit_detail()
+        # 조각 캐시 적중: 부품 행만 조회 (사진/제조사 메뉴는 캐시)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url)
+        self.assertContains(response, "헤드램프")
+        self.assertContains(response, "csrfmiddlewaretoken")
+
+    def test_detail_changes_on_part_and_image_save(self):
+        first = self.visit_detail()
+
+        self.part.stock = 0
+        self.part.save()
+        response = self.revalidate(self.detail_url, first)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "품절")
+
+        image = PartImage.objects.create(part=self.part, image="parts/another.jpg")
+        response2 = self.revalidate(self.detail_url, response)
+        self.assertEqual(response2.status_code, 200)
+        self.assertContains(response2, "parts/another.jpg")
+
+        image.delete()
+        response3 = self.revalidate(self.detail_url, response2)
+        self.assertEqual(response3.status_code, 200)
+        self.assertNotContains(response3, "parts/another.jpg")
+
+    def test_detail_changes_on_related_name_and_stock_ledger(self):
+        from shop.inventory import record_movements
+        from shop.models import InventoryMovement
+
+        first = self.visit_detail()
+        self.car_model.manufacturer.name = "현대자동차"
+        self.car_model.manufacturer.save()
+        response = self.revalidate(self.detail_url, first)
+        self.assertContains(response, "현대자동차")
+
+        record_movements([InventoryMovement(part=self.part, kind=InventoryMovement.Kind.ADJUST, delta=4)])
+        response2 = self.revalidate(self.detail_url, response)
+        self.assertContains(response2, "재고 7개")
+
+    def test_etag_differs_per_visitor(self):
+        anonymous = self.visit_detail()
+        self.client.cookies["sessionid"] = "another-session"
+        response = self.revalidate(self.detail_url, anonymous)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], anonymous["ETag"])
+
+    def test_list_not_modified_until_catalog_changes(self):
+        first = self.client.get(self.list_url)
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.revalidate(self.list_url, first).status_code, 304)
+
+        Part.objects.create(title="테일램프", car_model=self.car_model, price=30000)
+        response = self.revalidate(self.list_url, first)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "테일램프")
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 색인은 SQLite 기준")
+class PartSearchTest(TestCase):
+    """Part.objects.search: 긴 단어(trigram)/짧은 단어(두 글자 조각) 색인, 관련도, 트리거 동기화"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manufacturer = CarManufacturer.objects.create(name="현대")
+        car_model = CarModel.objects.create(manufacturer=cls.manufacturer, name="그랜저")
+        cls.bumper = Part.objects.create(title="앞범퍼 커버", car_model=car_model, part_number="86511-G8000", price=1000)
+        cls.door = Part.objects.create(title="운전석 도어", car_model=car_model, part_number="76003-G8000", price=1000)
+        cls.wheel = Part.objects.create(title="알루미늄 휠", car_model=car_model, part_number="52910-G8100", price=1000)
+        cls.bumper_bracket = Part.objects.create(
+            title="범퍼 브라켓 (범퍼 고정용)", car_model=car_model, part_number="86513-G8000", price=1000,
+        )
+
+    def search(self, q):
+        with CaptureQueriesContext(connection) as ctx:
+            found = list(Part.objects.search(q).order_by("-search_rank", "id"))
+        sql = ctx.captured_queries[-1]["sql"]
+        return found, sql
+
+    def test_bigram_document(self):
+        self.assertEqual(build_bigram_document("앞범퍼 도어 휠"), "앞범 범퍼 퍼 도어 어 휠")
+        self.assertEqual(build_bigram_document("ABC-1"), "ab bc c 1")
+
+    def test_long_term_uses_trigram_index(self):
+        found, sql = self.search("브라켓")
+        self.assertEqual(found, [self.bumper_bracket])
+        self.assertIn(FTS_TABLE, sql)
+        self.assertNotIn("LIKE", sql)
+
+    def test_short_terms_use_bigram_index(self):
+        # 두 글자 단어는 다른 단어 안에 있어도 찾음 (앞범퍼 ⊃ 범퍼)
+        found, sql = self.search("범퍼")
+        self.assertEqual(set(found), {self.bumper, self.bumper_bracket})
+        self.assertIn(BIGRAM_FTS_TABLE, sql)
+        self.assertNotIn("LIKE", sql)
+        # 한 글자 단어
+        found, sql = self.search("휠")
+        self.assertEqual(found, [self.wheel])
+        self.assertNotIn("LIKE", sql)
+        # 긴 단어와 짧은 단어를 함께
+        self.assertEqual(self.search("그랜저 도어")[0], [self.door])
+        # 문장부호가 섞인 짧은 단어는 LIKE로
+        self.assertIn("LIKE", self.search("G-")[1])
+
+    def test_relevance_order(self):
+        # "범퍼"가 두 번 들어간 부품이 먼저
+        found, _ = self.search("범퍼")
+        self.assertEqual(found[0], self.bumper_bracket)
+        ranks = list(Part.objects.search("범퍼 브라켓").values_list("search_rank", flat=True))
+        self.assertEqual(len(ranks), 1)
+        self.assertGreater(ranks[0], 0)
+
+    def test_index_follows_save(self):
+        self.door.title = "조수석 도어 몰딩"
+        self.door.save()
+        self.assertEqual(self.search("몰딩")[0], [self.door])
+        self.assertEqual(self.search("조수")[0], [self.door])
+        self.assertEqual(self.search("운전석")[0], [])
+        self.wheel.delete()
+        self.assertEqual(self.search("휠")[0], [])
+
+    def test_index_follows_related_name_change(self):
+        self.manufacturer.name = "제네시스"
+        self.manufacturer.save()
+        self.assertEqual(len(self.search("제네시스")[0]), 4)
+        self.assertEqual(len(self.search("제네")[0]), 4)
+        self.assertEqual(self.search("현대")[0], [])
+
+
+class FacetInvalidationTest(TestCase):
+    """사이드바 개수 칩과 상단 제조사 메뉴 캐시가 부품/분류 변경 때 갱신되는지"""
+
+    def setUp(self):
+        cache.clear()
+        self.manufacturer = CarManufacturer.objects.create(name="현대")
+        self.avante = CarModel.objects.create(manufacturer=self.manufacturer, name="아반떼")
+        self.sonata = CarModel.objects.create(manufacturer=self.manufacturer, name="쏘나타")
+        self.avante_ad = CarModelDetail.objects.create(model=self.avante, name="AD")
+        self.sonata_dn8 = CarModelDetail.objects.create(model=self.sonata, name="DN8")
+        self.bumper = PartSubCategory.objects.create(parent_category="front", name="범퍼")
+        self.grille = PartSubCategory.objects.create(parent_category="front", name="그릴")
+        self.part = Part.objects.create(title="앞범퍼", car_model=self.avante, car_model_detail=self.avante_ad,
+                                        subcategory=self.bumper, price=1000)
+
+    def counts(self, url, key):
+        return {obj.name: obj.part_count for obj in self.client.get(url).context[key]}
+
+    def model_counts(self):
+        return self.counts(reverse("parts:product_by_manufacturer", args=[self.manufacturer.id]), "manufacturer_models")
+
+    def detail_counts(self, car_model):
+        return self.counts(reverse("parts:product_by_model", args=[car_model.id]), "model_details")
+
+    def subcategory_counts(self):
+        return self.counts(reverse("parts:product_by_category", args=["front"]), "subcategory_list")
+
+    def menu(self):
+        response = self.client.get(reverse("parts:product_list"))
+        return {m.name: m.model_count for m in response.context["manufacturers"]}
+
+    def test_recategorize_part(self):
+        self.assertEqual(self.model_counts(), {"아반떼": 1, "쏘나타": 0})
+        self.assertEqual(self.detail_counts(self.avante), {"AD": 1})
+        self.assertEqual(self.detail_counts(self.sonata), {"DN8": 0})
+        self.assertEqual(self.subcategory_counts(), {"범퍼": 1, "그릴": 0})
+
+        # 시그널 없는 변경은 캐시된 개수 그대로 (캐시를 읽고 있음)
+        Part.objects.filter(pk=self.part.pk).update(subcategory=self.grille)
+        self.assertEqual(self.subcategory_counts(), {"범퍼": 1, "그릴": 0})
+        Part.objects.filter(pk=self.part.pk).update(subcategory=self.bumper)
+
+        part = Part.objects.get(pk=self.part.pk)
+        part.car_model, part.car_model_detail, part.subcategory = self.sonata, self.sonata_dn8, self.grille
+        part.save()
+        self.assertEqual(self.model_counts(), {"아반떼": 0, "쏘나타": 1})
+        self.assertEqual(self.detail_counts(self.avante), {"AD": 0})
+        self.assertEqual(self.detail_counts(self.sonata), {"DN8": 1})
+        self.assertEqual(self.subcategory_counts(), {"범퍼": 0, "그릴": 1})
+
+    def test_create_and_delete_part(self):
+        self.assertEqual(self.model_counts(), {"아반떼": 1, "쏘나타": 0})
+        self.assertEqual(self.subcategory_counts(), {"범퍼": 1, "그릴": 0})
+
+        part = Part.objects.create(title="라디에이터 그릴", car_model=self.avante, subcategory=self.grille, price=1000)
+        self.assertEqual(self.model_counts(), {"아반떼": 2, "쏘나타": 0})
+        self.assertEqual(self.subcategory_counts(), {"범퍼": 1, "그릴": 1})
+
+        part.delete()
+        self.assertEqual(self.model_counts(), {"아반떼": 1, "쏘나타": 0})
+        self.assertEqual(self.subcategory_counts(), {"범퍼": 1, "그릴": 0})
+
+    def test_manufacturer_menu(self):
+        self.assertEqual(self.menu(), {"현대": 2})
+
+        grandeur = CarModel.objects.create(manufacturer=self.manufacturer, name="그랜저")
+        self.assertEqual(self.menu(), {"현대": 3})
+        self.assertEqual(self.model_counts(), {"아반떼": 1, "쏘나타": 0, "그랜저": 0})
+
+        grandeur.delete()
+        kia = CarManufacturer.objects.create(name="기아")
+        self.assertEqual(self.menu(), {"현대": 2, "기아": 0})
+
+        kia.name = "KIA"
+        kia.save()
+        self.assertEqual(self.menu(), {"현대": 2, "KIA": 0})
+
+
+class SubcategoryDeleteTest(TestCase):
+    """세부 카테고리 삭제(SET_NULL) 시 대분류 복사본도 비워져 대분류 목록에서 빠지는지"""
+
+    def setUp(self):
+        cache.clear()
+        manufacturer = CarManufacturer.objects.create(name="현대")
+        car_model = CarModel.objects.create(manufacturer=manufacturer, name="그랜저")
+        self.sub = PartSubCategory.objects.create(parent_category="front", name="범퍼")
+        self.part = Part.objects.create(title="앞범퍼", car_model=car_model, subcategory=self.sub, price=1000)
+
+    def test_parent_category_cleared(self):
+        url = reverse("parts:product_by_category", args=["front"])
+        self.assertContains(self.client.get(url), "앞범퍼")
+
+        self.sub.delete()
+        self.part.refresh_from_db()
+        self.assertEqual((self.part.subcategory_id, self.part.parent_category), (None, ""))
+        self.assertNotContains(self.client.get(url), "앞범퍼")
+
+
+class YearRangeTest(TestCase):
+    """연식 문자열 해석, backfill_part_years, ?year= 연식 필터"""
+
+    def test_parse_year_range(self):
+        cases = {
+            "2015-2018": (2015, 2018),
+            "15~18": (2015, 2018),
+            "98~03": (1998, 2003),
+            "2017": (2017, 2017),
+            "2019~현재": (2019, None),
+            "2019.03~": (2019, None),
+            # 월이 붙은 표기 - 월 숫자는 연도로 보지 않음
+            "2015.03~2018.05": (2015, 2018),
+            "15.03~18.05": (2015, 2018),
+            "2015/03-2018/05": (2015, 2018),
+            "15년 03월~18년 5월": (2015, 2018),
+            # 여러 연도는 처음과 마지막
+            "2012, 2014, 2016": (2012, 2016),
+            "": (None, None),
+            "전 연식": (None, None),
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(parse_year_range(value), expected)
+
+    def make_parts(self):
+        manufacturer = CarManufacturer.objects.create(name="기아")
+        self.car_model = CarModel.objects.create(manufacturer=manufacturer, name="모닝")
+        return [
+            Part.objects.create(title=title, car_model=self.car_model, applicable_years=years, price=1000)
+            for title, years in (("구형 범퍼", "2011.03~2015.05"), ("신형 범퍼", "2017~현재"), ("연식 미상", "-"))
+        ]
+
+    def test_backfill_command(self):
+        old, new, unknown = self.make_parts()
+        Part.objects.update(year_from=None, year_to=None)
+        out = StringIO()
+        call_command("backfill_part_years", stdout=out)
+        self.assertIn("연식 갱신 2건, 해석 불가 1건", out.getvalue())
+        old.refresh_from_db()
+        new.refresh_from_db()
+        self.assertEqual((old.year_from, old.year_to), (2011, 2015))
+        self.assertEqual((new.year_from, new.year_to), (2017, None))
+
+        # 이미 값이 있으면 --all 일 때만 다시 계산
+        Part.objects.filter(pk=old.pk).update(year_from=2003, year_to=2011)
+        call_command("backfill_part_years", stdout=StringIO())
+        old.refresh_from_db()
+        self.assertEqual(old.year_from, 2003)
+        call_command("backfill_part_years", "--all", stdout=StringIO())
+        old.refresh_from_db()
+        self.assertEqual((old.year_from, old.year_to), (2011, 2015))
+
+    def test_year_filter(self):
+        cache.clear()
+        self.make_parts()
+        url = reverse("parts:product_by_model", args=[self.car_model.id])
+
+        def titles(year):
+            response = self.client.get(url, {"year": year})
+            return {p.title for p in response.context["products"]}
+
+        self.assertEqual(titles(2013), {"구형 범퍼"})
+        self.assertEqual(titles(2030), {"신형 범퍼"})
+        self.assertEqual(titles(2016), set())
+        # 숫자가 아니거나 범위 밖이면 필터 없음
+        self.assertEqual(titles("abc"), {"구형 범퍼", "신형 범퍼", "연식 미상"})
+        self.assertEqual(titles(3000), {"구형 범퍼", "신형 범퍼", "연식 미상"})
+
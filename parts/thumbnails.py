@@ -0,0 +1,61 @@
+"""
+부품 사진 축소본(목록/상세/확대) 생성.
+원본 옆에 "파일명.<크기>.jpg", "파일명.<크기>.webp"로 저장한다.
+"""
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# 이름: (최대 가로, 최대 세로) - 비율 유지
+VARIANTS = getattr(settings, "PART_IMAGE_VARIANTS", {
+    "thumb": (260, 260),    # 목록 (120~130px 표시, 고해상도 화면 대비 2배)
+    "detail": (700, 525),   # 상세 메인 이미지
+    "zoom": (1600, 1200),   # 확대 팝업
+})
+FORMATS = {
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+}
+
+
+def variant_name(name, size, ext):
+    root, _ = os.path.splitext(name)
+    return f"{root}.{size}.{ext}"
+
+
+def _open_rgb(field):
+    field.open("rb")
+    try:
+        img = Image.open(field)
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel("A"))
+            return background
+        return img.convert("RGB")
+    finally:
+        field.close()
+
+
+def generate_variants(field):
+    """ImageField 파일로 모든 축소본을 만들어 같은 storage에 저장"""
+    storage = field.storage
+    source = _open_rgb(field)
+    for size, box in VARIANTS.items():
+        resized = source.copy()
+        resized.thumbnail(box, Image.LANCZOS)
+        for ext, (fmt, options) in FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, fmt, **options)
+            name = variant_name(field.name, size, ext)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def variant_url(field, size, ext):
+    return field.storage.url(variant_name(field.name, size, ext))
@@ -0,0 +1,31 @@
+import re
+
+# 네 자리 연도, 또는 단독 두 자리 연도 ("15~18")
+# 두 자리는 "2015.03", "15/03", "03월"처럼 월을 나타내는 숫자는 제외
+YEAR_RE = re.compile(r"(?<!\d)\d{4}(?!\d)|(?<![\d./])\d{2}(?!\d|\s*월)")
+OPEN_END_RE = re.compile(r"[-~]\s*(현재|이후|$)")
+
+
+def _to_full_year(y):
+    y = int(y)
+    if y >= 100:
+        return y
+    return 2000 + y if y < 70 else 1900 + y
+
+
+def parse_year_range(value):
+    """
+    연식 문자열을 (year_from, year_to)로 변환.
+    "2015-2018" → (2015, 2018), "15~18" → (2015, 2018),
+    "2015.03~2018.05" → (2015, 2018), "2017" → (2017, 2017), "2019~현재" → (2019, None),
+    해석 불가 → (None, None). 연도가 여러 개면 처음과 마지막 연도를 쓴다.
+    """
+    years = [_to_full_year(y) for y in YEAR_RE.findall(value or "")]
+    if not years:
+        return None, None
+    if len(years) == 1:
+        if OPEN_END_RE.search(value):
+            return years[0], None
+        return years[0], years[0]
+    first, second = years[0], years[-1]
+    return min(first, second), max(first, second)
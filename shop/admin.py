@@ -1,5 +1,6 @@
 from django.contrib import admin, messages
-from .models import Order, OrderItem
+from .inventory import record_movements
+from .models import InventoryMovement, Order, OrderItem
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
@@ -25,36 +26,37 @@ class OrderAdmin(admin.ModelAdmin):
 
     @admin.action(description="입금확인 + 재고 차감")
     def confirm_and_apply_stock(self, request, queryset):
-        done, skipped = 0, 0
-        for o in queryset:
-            if o.stock_applied and o.status == Order.Status.CONFIRMED:
-                skipped += 1
-                continue
-            o.status = Order.Status.CONFIRMED
-            o.save(update_fields=["status"])  # post_save 시그널이 apply_stock 호출
-            if not o.stock_applied:
-                o.apply_stock()  # 시그널 미로드 대비
-            done += 1
+        targets = queryset.exclude(status=Order.Status.CONFIRMED, stock_applied=True)
+        skipped = queryset.count() - targets.count()
+        done = targets.transition(Order.Status.CONFIRMED)  # 부품별 합산 UPDATE로 재고 차감
         self.message_user(request, f"처리 {done}건, 건너뜀 {skipped}건", level=messages.SUCCESS)
 
     @admin.action(description="주문접수로 되돌리기 + 재고 복원")
     def revert_to_requested_and_restore(self, request, queryset):
-        done, skipped = 0, 0
-        for o in queryset:
-            if o.stock_applied:  # confirmed에서 내려오는 케이스
-                o.unapply_stock()
-            o.status = Order.Status.REQUESTED
-            o.save(update_fields=["status"])
-            done += 1
-        self.message_user(request, f"처리 {done}건, 건너뜀 {skipped}건", level=messages.SUCCESS)
+        done = queryset.transition(Order.Status.REQUESTED)  # 차감된 주문만 재고 복원
+        self.message_user(request, f"처리 {done}건, 건너뜀 0건", level=messages.SUCCESS)
 
     @admin.action(description="주문취소 + 재고 복원")
     def cancel_and_restore(self, request, queryset):
-        done, skipped = 0, 0
-        for o in queryset:
-            if o.stock_applied:
-                o.unapply_stock()
-            o.status = Order.Status.CANCELLED
-            o.save(update_fields=["status"])
-            done += 1
-        self.message_user(request, f"처리 {done}건, 건너뜀 {skipped}건", level=messages.SUCCESS)
+        done = queryset.transition(Order.Status.CANCELLED)
+        self.message_user(request, f"처리 {done}건, 건너뜀 0건", level=messages.SUCCESS)
+
+
+@admin.register(InventoryMovement)
+class InventoryMovementAdmin(admin.ModelAdmin):
+    """재고 이력 (추가만 가능)"""
+    list_display = ("id", "part", "kind", "delta", "order", "memo", "created_at")
+    list_filter = ("kind", "created_at")
+    search_fields = ("part__title", "part__part_number", "memo")
+    autocomplete_fields = ("part",)
+    raw_id_fields = ("order",)
+    list_select_related = ("part", "order")
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def save_model(self, request, obj, form, change):
+        record_movements([obj])  # 이력 추가 + 재고 재계산
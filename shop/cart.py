@@ -6,12 +6,21 @@ from parts.models import Part   # ← 반드시 Part로!
 CART_SESSION_ID = getattr(settings, "CART_SESSION_ID", "cart")
 
 class Cart:
-    def __init__(self, request):
+    """
+    세션 장바구니.
+    부품 조회와 합계/상태 계산은 처음 필요할 때 한 번만 하고(스냅샷),
+    add/remove/clear로 내용이 바뀔 때만 다시 계산한다.
+    """
+
+    def __init__(self, request, with_images=True):
         self.session = request.session
+        # JSON 응답처럼 이미지가 필요 없으면 prefetch 생략
+        self.with_images = with_images
         cart = self.session.get(CART_SESSION_ID)
         if cart is None:
             cart = self.session[CART_SESSION_ID] = {}
         self.cart = cart
+        self._snapshot = None
 
     def add(self, part_id, qty=1, replace=False):
         pid = str(part_id)
@@ -32,57 +41,90 @@ class Cart:
             self.save()
 
     def clear(self):
-        self.session[CART_SESSION_ID] = {}
+        self.cart = self.session[CART_SESSION_ID] = {}
         self.save()
 
-    def __iter__(self):
+    def _build_item(self, part, qty):
+        # 가격 필드명에 맞게 수정 (price가 아니라면 여기 바꾸세요)
+        raw_price = getattr(part, "price", None)
+
+        # 0 또는 None이면 '전화문의' 취급
+        if raw_price in (None, 0, "0", ""):
+            price = None
+        else:
+            price = Decimal(raw_price)
+
+        subtotal = Decimal("0") if price is None else price * qty
+
+        stock = getattr(part, "stock", None)
+        stock_ok = True if (stock is None or qty <= stock) else False
+
+        return {
+            "product": part,     # ← 템플릿의 p=item.product 와 일치!
+            "qty": qty,
+            "price": price,
+            "subtotal": subtotal,
+            "stock": stock,
+            "stock_ok": stock_ok,
+        }
+
+    def _load(self):
+        """담긴 부품을 한 번에 조회해 줄/합계/상태 스냅샷을 만든다"""
         pids = list(self.cart.keys())
-        parts = Part.objects.filter(id__in=pids)      # ← Part로 조회
+        parts = (Part.objects
+                 .filter(id__in=pids)      # ← Part로 조회
+                 .select_related("car_model__manufacturer", "subcategory"))
+        if self.with_images:
+            parts = parts.prefetch_related("images")
         pmap = {str(p.id): p for p in parts}
 
+        items, stale = [], []
         for pid in pids:
             part = pmap.get(pid)
             if not part:
-                # 삭제되었거나 없는 부품은 세션에서 제거
-                del self.cart[pid]
-                self.save()
+                stale.append(pid)
                 continue
+            items.append(self._build_item(part, int(self.cart[pid]["qty"])))
+
+        if stale:
+            # 삭제되었거나 없는 부품은 세션에서 한꺼번에 제거
+            for pid in stale:
+                del self.cart[pid]
+            self.save()
 
-            qty = int(self.cart[pid]["qty"])
-            # 가격 필드명에 맞게 수정 (price가 아니라면 여기 바꾸세요)
-            raw_price = getattr(part, "price", None)
+        return {
+            "items": items,
+            "index": {str(item["product"].id): item for item in items},
+            "total": sum((item["subtotal"] for item in items), Decimal("0")),
+            "has_inquiry_only": any(item["price"] is None for item in items),
+            "has_stock_issue": any(not item["stock_ok"] for item in items),
+        }
 
-            # 0 또는 None이면 '전화문의' 취급
-            if raw_price in (None, 0, "0", ""):
-                price = None
-            else:
-                price = Decimal(raw_price)
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = self._load()
+        return self._snapshot
 
-            subtotal = Decimal("0") if price is None else price * qty
+    def __iter__(self):
+        return iter(self.snapshot["items"])
 
-            stock = getattr(part, "stock", None)
-            stock_ok = True if (stock is None or qty <= stock) else False
+    def __len__(self):
+        return len(self.snapshot["items"])
 
-            yield {
-                "product": part,     # ← 템플릿의 p=item.product 와 일치!
-                "qty": qty,
-                "price": price,
-                "subtotal": subtotal,
-                "stock": stock,
-                "stock_ok": stock_ok,
-            }
+    def get_item(self, part_id):
+        """part_id 줄 (없으면 None)"""
+        return self.snapshot["index"].get(str(part_id))
 
     def total(self):
-        t = Decimal("0")
-        for item in self:
-            t += item["subtotal"]
-        return t
+        return self.snapshot["total"]
 
     def has_inquiry_only(self):
-        return any(item["price"] is None for item in self)
+        return self.snapshot["has_inquiry_only"]
 
     def has_stock_issue(self):
-        return any(not item["stock_ok"] for item in self)
+        return self.snapshot["has_stock_issue"]
 
     def save(self):
+        self._snapshot = None
         self.session.modified = True
@@ -0,0 +1,102 @@
+"""
+주문 생성(체크아웃).
+
+주문 접수는 한 트랜잭션에서 처리한다.
+  1) 관련 부품 행을 id 순서로 select_for_update (동시 주문끼리 순서대로 대기, 교착 방지)
+  2) 재고 - 다른 주문의 유효한 예약 수량 >= 주문 수량 확인
+  3) Order 저장(합계 캐시 포함) + OrderItem bulk_create
+주문 줄 수와 관계없이 쿼리 수가 일정하다.
+
+SQLite는 select_for_update가 없으므로 이 트랜잭션만 BEGIN IMMEDIATE로 시작해(immediate_transaction)
+동시 주문을 차례로 세운다. 잠금을 끝내 얻지 못하면(busy_timeout 초과) OrderError로 돌려준다.
+
+ORDER_STOCK_RESERVATION_MINUTES(기본 30분) 동안 접수된 주문 수량을 다른 주문이 가져가지 못하게 예약한다.
+입금확인(apply_stock)되면 실제 재고에서 차감되고, 기한이 지나면 예약은 자동으로 풀린다.
+None/0이면 예약하지 않는다.
+"""
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.models import Sum
+from django.utils import timezone
+
+from doori.sqlite3.base import immediate_transaction
+from parts.models import Part
+from .models import Order, OrderItem
+
+RESERVATION_MINUTES = getattr(settings, "ORDER_STOCK_RESERVATION_MINUTES", 30)
+
+
+class OrderError(Exception):
+    """주문할 수 없는 상태 (메시지는 사용자에게 그대로 보여줌)"""
+
+
+def reserved_quantities(part_ids, now=None):
+    """부품별 유효 예약 수량 {part_id: qty} - 입금확인 전이고 기한이 남은 주문"""
+    now = now or timezone.now()
+    rows = (OrderItem.objects
+            .filter(part_id__in=part_ids,
+                    order__status=Order.Status.REQUESTED,
+                    order__stock_applied=False,
+                    order__reserved_until__gt=now)
+            .values("part_id")
+            .annotate(qty=Sum("quantity")))
+    return {row["part_id"]: row["qty"] for row in rows}
+
+
+def place_order(order, lines):
+    """
+    order: 저장 전 Order (주문자 정보만 채운 상태)
+    lines: [(part_id, qty), ...]  같은 부품이 여러 번 있으면 합산
+    재고 부족/전화문의/없는 상품이면 OrderError (아무것도 저장하지 않음)
+    """
+    quantities = OrderedDict()
+    for part_id, qty in lines:
+        quantities[int(part_id)] = quantities.get(int(part_id), 0) + int(qty)
+    if not quantities or any(qty < 1 for qty in quantities.values()):
+        raise OrderError("주문할 상품이 없습니다.")
+
+    try:
+        with immediate_transaction():
+            part_ids = sorted(quantities)
+            parts = {p.id: p for p in (Part.objects
+                                       .select_for_update()
+                                       .filter(id__in=part_ids)
+                                       .order_by("id")
+                                       .only("id", "title", "price", "stock"))}
+            if len(parts) != len(part_ids):
+                raise OrderError("판매가 종료된 상품이 포함되어 있습니다.")
+
+            now = timezone.now()
+            reserved = reserved_quantities(part_ids, now) if RESERVATION_MINUTES else {}
+
+            for part_id, qty in quantities.items():
+                part = parts[part_id]
+                if part.price in (None, 0):
+                    raise OrderError(f"{part.title}: 전화문의 상품은 주문할 수 없습니다.")
+                if part.stock is not None and qty > part.stock - reserved.get(part_id, 0):
+                    raise OrderError(f"{part.title}: 재고가 부족합니다.")
+
+            # 합계 캐시는 INSERT 때 함께 저장 (bulk_create는 OrderItem 시그널이 없음)
+            order.total_amount = sum(parts[pid].price * qty for pid, qty in quantities.items())
+            order.item_count = sum(quantities.values())
+            if RESERVATION_MINUTES:
+                order.reserved_until = now + timedelta(minutes=RESERVATION_MINUTES)
+            order.save()
+
+            OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order,
+                    part_id=part_id,
+                    title=parts[part_id].title,
+                    unit_price=parts[part_id].price,
+                    quantity=qty,
+                )
+                for part_id, qty in quantities.items()
+            ])
+    except OperationalError:
+        # 다른 주문이 쓰기 잠금을 오래 쥐고 있음 (SQLite "database is locked")
+        raise OrderError("주문이 몰려 처리하지 못했습니다. 잠시 후 다시 시도해 주세요.")
+    return order
@@ -0,0 +1,149 @@
+"""
+재고 원장과 주문 묶음 단위 재고 차감/복원.
+
+재고 변동은 InventoryMovement 행을 추가(INSERT)하는 것으로만 기록하고,
+Part.stock은 변동이 생긴 부품들만 원장 합계로 UPDATE 한 번에 다시 계산한다.
+주문 묶음은 (주문, 부품)별 수량을 합산해 이력을 bulk_create 하고 stock_applied도 UPDATE 한 번으로 표시한다.
+주문 수와 관계없이 쿼리 수가 일정하다.
+
+원장은 0 아래로 내려가지 않게 한다.
+  - 입금확인 차감은 남은 재고까지만 (모자란 수량은 이력 메모에 남김)
+  - 복원은 그 주문이 실제로 차감한 만큼만
+원장이 음수면 표시 재고(0)와 어긋나 이후 입고분이 재고에 나타나지 않기 때문이다.
+"""
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Now
+
+from parts.models import Part
+from .models import InventoryMovement, Order, OrderItem
+
+
+def refresh_stock(part_ids=None):
+    """
+    원장 합계로 Part.stock 다시 계산 (part_ids가 None이면 전체). 값이 바뀐 부품 수를 돌려준다.
+    바뀐 부품만 updated_at도 갱신한다 (상세 화면 ETag/조각 캐시 기준).
+    """
+    balance = Subquery(
+        InventoryMovement.objects
+        .filter(part_id=OuterRef("pk"))
+        .values("part_id")
+        .annotate(total=Sum("delta"))
+        .values("total")
+    )
+    parts = Part.objects.all() if part_ids is None else Part.objects.filter(id__in=part_ids)
+    return (parts
+            # 원장은 음수가 되지 않게 기록하므로 Greatest는 수동 이력 등에 대한 안전장치
+            .alias(balance=Greatest(Coalesce(balance, Value(0)), Value(0)))
+            .exclude(stock=F("balance"))
+            .update(stock=F("balance"), updated_at=Now()))
+
+
+def record_movements(movements):
+    """
+    InventoryMovement 여러 건 추가 후 관련 부품 재고만 다시 계산.
+    증감 0은 건너뛰되, 주문 이력은 남긴다 (재고 부족으로 차감 못 한 주문도 복원 기준이 있도록).
+    """
+    movements = [m for m in movements if m.delta or m.order_id]
+    if not movements:
+        return []
+    with transaction.atomic():
+        InventoryMovement.objects.bulk_create(movements)
+        refresh_stock({m.part_id for m in movements})
+    return movements
+
+
+def _lock_order_ids(orders, stock_applied):
+    # 같은 주문이 동시에 두 번 반영되지 않도록 주문 행을 잠그고 id만 가져옴
+    return list(orders.filter(stock_applied=stock_applied)
+                .select_for_update()
+                .order_by("id")
+                .values_list("id", flat=True))
+
+
+def _order_rows(order_ids):
+    """
+    (주문, 부품)별 주문 수량과 그 주문이 원장에 남긴 차감/복원 합계(moved).
+    moved가 None이면 원장 도입 전에 차감된 주문 (주문 수량만큼 차감된 것으로 봄).
+    """
+    moved = Subquery(
+        InventoryMovement.objects
+        .filter(order_id=OuterRef("order_id"), part_id=OuterRef("part_id"),
+                kind__in=[InventoryMovement.Kind.ORDER, InventoryMovement.Kind.ORDER_RETURN])
+        .values("order_id")
+        .annotate(total=Sum("delta"))
+        .values("total")
+    )
+    return (OrderItem.objects
+            .filter(order_id__in=order_ids, part__isnull=False)
+            .values("order_id", "part_id")
+            .annotate(qty=Sum("quantity"), moved=moved)
+            .order_by("order_id", "part_id"))
+
+
+def _ledger_balances(part_ids):
+    rows = (InventoryMovement.objects
+            .filter(part_id__in=part_ids)
+            .values("part_id")
+            .annotate(total=Sum("delta")))
+    return {row["part_id"]: row["total"] for row in rows}
+
+
+def apply_stock(orders):
+    """
+    아직 차감 전인 주문들의 수량만큼 재고 차감. 차감한 주문 수를 돌려준다.
+    재고보다 많이 팔린 수량은 차감하지 않고 이력 메모에 "재고 부족 n개"로 남긴다 (먼저 들어온 주문부터 차감).
+    """
+    with transaction.atomic():
+        order_ids = _lock_order_ids(orders, stock_applied=False)
+        if not order_ids:
+            return 0
+        rows = list(_order_rows(order_ids))
+        balances = _ledger_balances({row["part_id"] for row in rows})
+        movements = []
+        for row in rows:
+            available = max(balances.get(row["part_id"], 0), 0)
+            taken = min(row["qty"], available)
+            balances[row["part_id"]] = available - taken
+            short = row["qty"] - taken
+            movements.append(InventoryMovement(
+                part_id=row["part_id"], order_id=row["order_id"], kind=InventoryMovement.Kind.ORDER,
+                delta=-taken, memo=f"재고 부족 {short}개" if short else "",
+            ))
+        record_movements(movements)
+        Order.objects.filter(id__in=order_ids).update(stock_applied=True)
+    return len(order_ids)
+
+
+def unapply_stock(orders):
+    """차감된 주문들이 실제로 차감한 수량만큼 재고 복원. 복원한 주문 수를 돌려준다."""
+    with transaction.atomic():
+        order_ids = _lock_order_ids(orders, stock_applied=True)
+        if not order_ids:
+            return 0
+        movements = [
+            InventoryMovement(part_id=row["part_id"], order_id=row["order_id"],
+                              kind=InventoryMovement.Kind.ORDER_RETURN,
+                              delta=row["qty"] if row["moved"] is None else -row["moved"])
+            for row in _order_rows(order_ids)
+        ]
+        record_movements([m for m in movements if m.delta])
+        Order.objects.filter(id__in=order_ids).update(stock_applied=False)
+    return len(order_ids)
+
+
+def transition_orders(orders, status):
+    """
+    주문 묶음의 상태를 한 번에 변경 (개별 save()/시그널 없이).
+      - 입금확인으로    : 차감 전 주문의 재고 차감
+      - 주문접수/취소로 : 차감된 주문의 재고 복원
+    상태를 바꾼 주문 수를 돌려준다.
+    """
+    with transaction.atomic():
+        order_ids = list(orders.select_for_update().order_by("id").values_list("id", flat=True))
+        targets = Order.objects.filter(id__in=order_ids)
+        if status == Order.Status.CONFIRMED:
+            apply_stock(targets)
+        elif status in (Order.Status.REQUESTED, Order.Status.CANCELLED):
+            unapply_stock(targets)
+        return targets.update(status=status)
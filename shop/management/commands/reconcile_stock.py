@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from parts.models import Part
+from shop.inventory import refresh_stock
+from shop.models import InventoryMovement
+
+
+class Command(BaseCommand):
+    help = "재고 원장(InventoryMovement) 합계로 Part.stock을 일괄 재계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="불일치 부품만 출력")
+        parser.add_argument("--adopt", action="store_true",
+                            help="원장 대신 현재 Part.stock을 맞는 값으로 보고 차이만큼 수동 조정 이력 추가")
+
+    def mismatched(self):
+        balance = Subquery(
+            InventoryMovement.objects
+            .filter(part_id=OuterRef("pk"))
+            .values("part_id")
+            .annotate(total=Sum("delta"))
+            .values("total")
+        )
+        return (Part.objects
+                .annotate(ledger=Coalesce(balance, Value(0)))
+                .exclude(stock=Greatest(F("ledger"), Value(0)))
+                .values_list("id", "stock", "ledger"))
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        rows = list(self.mismatched())
+
+        if options["dry_run"]:
+            for part_id, stock, ledger in rows:
+                self.stdout.write(f"Part#{part_id}: stock={stock}, 원장={ledger}")
+            self.stdout.write(self.style.WARNING(f"불일치 {len(rows)}건"))
+            return
+
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            with transaction.atomic():
+                if options["adopt"]:
+                    InventoryMovement.objects.bulk_create([
+                        InventoryMovement(part_id=part_id, delta=stock - ledger,
+                                          kind=InventoryMovement.Kind.ADJUST, memo="재고 맞춤")
+                        for part_id, stock, ledger in batch
+                    ])
+                refresh_stock([part_id for part_id, _, _ in batch])
+
+        self.stdout.write(self.style.SUCCESS(f"재고 재계산 {len(rows)}건"))
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0002_order_stock_applied'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='order',
+            options={'verbose_name': '주문', 'verbose_name_plural': '주문 관리'},
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='reserved_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='재고 예약 기한'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def record_opening_stock(apps, schema_editor):
+    # 현재 재고를 원장의 시작 잔액으로 기록
+    Part = apps.get_model('parts', 'Part')
+    InventoryMovement = apps.get_model('shop', 'InventoryMovement')
+    db = schema_editor.connection.alias
+    parts = Part.objects.using(db).filter(stock__gt=0).values_list('id', 'stock')
+    InventoryMovement.objects.using(db).bulk_create(
+        (InventoryMovement(part_id=part_id, delta=stock, kind='adjust', memo='기초 재고')
+         for part_id, stock in parts.iterator(chunk_size=500)),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0013_partimage_variants_ready'),
+        ('shop', '0003_order_reserved_until'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField(verbose_name='증감')),
+                ('kind', models.CharField(choices=[('order', '주문 차감'), ('order_return', '주문 복원'), ('restock', '입고'), ('adjust', '수동 조정')], max_length=20, verbose_name='구분')),
+                ('memo', models.CharField(blank=True, max_length=255, verbose_name='메모')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='shop.order', verbose_name='주문')),
+                ('part', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='parts.part', verbose_name='부품')),
+            ],
+            options={
+                'verbose_name': '재고 이력',
+                'verbose_name_plural': '재고 이력',
+                'indexes': [models.Index(fields=['part', 'delta'], name='movement_part_delta_idx')],
+            },
+        ),
+        migrations.RunPython(record_opening_stock, migrations.RunPython.noop),
+    ]
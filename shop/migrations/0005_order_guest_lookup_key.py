@@ -0,0 +1,42 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:26
+
+import hashlib
+import re
+
+from django.db import migrations, models
+
+
+def make_guest_lookup_key(name, hp):
+    # 이 마이그레이션 시점의 shop.utils.make_guest_lookup_key 사본 (앱 코드가 바뀌어도 이력 마이그레이션은 그대로)
+    digits = re.sub(r"\D", "", hp or "")
+    name = (name or "").strip()
+    if not (name and digits):
+        return ""
+    return hashlib.sha256(f"{name}:{digits}".encode()).hexdigest()
+
+
+def fill_guest_lookup_key(apps, schema_editor):
+    Order = apps.get_model('shop', 'Order')
+    orders = (Order.objects.using(schema_editor.connection.alias)
+              .filter(user__isnull=True).only('id', 'guest_name', 'guest_hp'))
+    batch = []
+    for order in orders.iterator(chunk_size=500):
+        order.guest_lookup_key = make_guest_lookup_key(order.guest_name, order.guest_hp)
+        batch.append(order)
+    Order.objects.using(schema_editor.connection.alias).bulk_update(batch, ['guest_lookup_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0004_inventorymovement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='guest_lookup_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(fill_guest_lookup_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.23 on 2026-10-18 11:27
+
+from django.db import migrations, models
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_order_totals(apps, schema_editor):
+    Order = apps.get_model('shop', 'Order')
+    OrderItem = apps.get_model('shop', 'OrderItem')
+    db = schema_editor.connection.alias
+    items = OrderItem.objects.using(db).filter(order_id=OuterRef('pk')).values('order_id')
+    amount = ExpressionWrapper(F('unit_price') * F('quantity'), output_field=DecimalField(max_digits=12, decimal_places=0))
+    Order.objects.using(db).update(
+        total_amount=Coalesce(Subquery(items.annotate(s=Sum(amount)).values('s')),
+                              Value(0, output_field=DecimalField(max_digits=12, decimal_places=0))),
+        item_count=Coalesce(Subquery(items.annotate(s=Sum('quantity')).values('s')), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0005_order_guest_lookup_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='상품수'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=0, default=0, editable=False, max_digits=12, verbose_name='주문금액'),
+        ),
+        migrations.RunPython(fill_order_totals, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,29 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.hashers import check_password
 from parts.models import Part
-from django.db.models import F, Value, IntegerField, Case, When
+from .utils import make_guest_lookup_key
+
+class OrderQuerySet(models.QuerySet):
+    def transition(self, status):
+        """묶음 상태 변경 + 재고 차감/복원 (shop.inventory.transition_orders)"""
+        from .inventory import transition_orders
+
+        return transition_orders(self, status)
+
+    def refresh_totals(self):
+        """주문 아이템 합계로 total_amount/item_count 캐시 컬럼 갱신 (UPDATE 한 번)"""
+        items = OrderItem.objects.filter(order_id=OuterRef("pk")).values("order_id")
+        amount = ExpressionWrapper(F("unit_price") * F("quantity"),
+                                   output_field=DecimalField(max_digits=12, decimal_places=0))
+        return self.update(
+            total_amount=Coalesce(Subquery(items.annotate(s=Sum(amount)).values("s")),
+                                  Value(0, output_field=DecimalField(max_digits=12, decimal_places=0))),
+            item_count=Coalesce(Subquery(items.annotate(s=Sum("quantity")).values("s")), Value(0)),
+        )
+
 
 class Order(models.Model):
     class Status(models.TextChoices):
@@ -21,60 +42,68 @@ class Order(models.Model):
     guest_hp    = models.CharField(max_length=20, blank=True)
     guest_email = models.EmailField(blank=True)
     guest_password = models.CharField(max_length=256, blank=True)  # 해시 저장
+    guest_lookup_key = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
 
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.REQUESTED)
     memo   = models.TextField(blank=True)  # 고객 메모 등
     created_at = models.DateTimeField(auto_now_add=True)
 
     stock_applied = models.BooleanField(default=False, verbose_name="재고 차감 완료")
+    # 입금확인 전까지 재고를 잡아두는 기한 (shop.checkout 참고)
+    reserved_until = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="재고 예약 기한")
+
+    # 아이템 합계 캐시 (OrderItem 저장/삭제 시 OrderQuerySet.refresh_totals로 갱신)
+    total_amount = models.DecimalField(max_digits=12, decimal_places=0, default=0, editable=False, verbose_name="주문금액")
+    item_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="상품수")
+    CACHED_FIELDS = {"total_amount", "item_count"}
+
+    objects = OrderQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 불러올 때의 상태를 기억 → 저장 시 다시 조회하지 않고 상태 변화 판단 (shop.signal)
+        if "status" in instance.__dict__:
+            instance._loaded_status = instance.status
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"guest_name", "guest_hp"}.intersection(update_fields):
+            self.guest_lookup_key = make_guest_lookup_key(self.guest_name, self.guest_hp) if not self.user_id else ""
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "guest_lookup_key"}
+        if update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # 메모리의 합계 캐시가 오래됐을 수 있으므로 기존 주문 저장 시에는 쓰지 않음
+            kwargs["update_fields"] = [f.name for f in self._meta.concrete_fields
+                                       if not f.primary_key and f.name not in self.CACHED_FIELDS]
+        super().save(*args, **kwargs)
 
     def apply_stock(self):
         """입금확인 시 1회만 재고 차감 (음수 방지)."""
+        from .inventory import apply_stock
+
         if self.stock_applied:
             return
-
-        items = self.items.select_related("part").only("id", "quantity", "part__id", "part__stock")
-        from parts.models import Part  # 같은 앱이면 상대 import도 가능: from .models import Part
-
-        for it in items:
-            p = it.part
-            if not p:
-                continue
-            # 필요 시 전화문의 제외 조건 추가 가능:
-            # if it.unit_price is None: continue
-
-            Part.objects.filter(pk=p.pk).update(
-                stock=Case(
-                    When(stock__gte=it.quantity, then=F("stock") - it.quantity),
-                    default=Value(0),
-                    output_field=IntegerField(),
-                )
-            )
-
+        apply_stock(Order.objects.filter(pk=self.pk))
         self.stock_applied = True
-        self.save(update_fields=["stock_applied"])
 
     def unapply_stock(self):
         """취소/주문접수로 되돌릴 때 1회만 재고 복원."""
+        from .inventory import unapply_stock
+
         if not self.stock_applied:
             return
-
-        items = self.items.select_related("part").only("id", "quantity", "part__id", "part__stock")
-        from shop.models import Part
-
-        for it in items:
-            p = it.part
-            if not p:
-                continue
-            Part.objects.filter(pk=p.pk).update(stock=F("stock") + it.quantity)
-
+        unapply_stock(Order.objects.filter(pk=self.pk))
         self.stock_applied = False
-        self.save(update_fields=["stock_applied"])
 
     def total(self):
-        return sum((i.subtotal() for i in self.items.all()), 0)
+        return self.total_amount
 
     def has_inquiry_only(self):
+        # prefetch된 아이템이 있으면 추가 쿼리 없이 판단
+        if "items" in getattr(self, "_prefetched_objects_cache", {}):
+            return any(i.unit_price is None for i in self.items.all())
         return self.items.filter(unit_price__isnull=True).exists()
 
     def check_guest_password(self, raw_pw):
@@ -100,3 +129,42 @@ class OrderItem(models.Model):
 
     def __str__(self):
         return f"{self.title} x{self.quantity}"
+
+
+class InventoryMovement(models.Model):
+    """
+    재고 원장 (추가만 하고 수정/삭제하지 않음).
+    Part.stock은 부품별 delta 합계를 저장해 둔 값이다 (shop.inventory.refresh_stock).
+    """
+    class Kind(models.TextChoices):
+        ORDER = "order", "주문 차감"
+        ORDER_RETURN = "order_return", "주문 복원"
+        RESTOCK = "restock", "입고"
+        ADJUST = "adjust", "수동 조정"
+
+    part  = models.ForeignKey("parts.Part", related_name="movements", on_delete=models.CASCADE, verbose_name="부품")
+    delta = models.IntegerField(verbose_name="증감")
+    kind  = models.CharField(max_length=20, choices=Kind.choices, verbose_name="구분")
+    order = models.ForeignKey(Order, null=True, blank=True, related_name="movements",
+                              on_delete=models.SET_NULL, verbose_name="주문")
+    memo  = models.CharField(max_length=255, blank=True, verbose_name="메모")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "재고 이력"
+        verbose_name_plural = "재고 이력"
+        indexes = [
+            # 부품별 합계를 인덱스만으로 계산
+            models.Index(fields=["part", "delta"], name="movement_part_delta_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("재고 이력은 수정할 수 없습니다. 반대 방향 이력을 추가하세요.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("재고 이력은 삭제할 수 없습니다.")
+
+    def __str__(self):
+        return f"{self.part_id} {self.delta:+d} ({self.get_kind_display()})"
@@ -1,24 +1,34 @@
-from django.db.models.signals import pre_save, post_save
+from django.db.models import Sum
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import Order
+from parts.models import Part
+from .models import InventoryMovement, Order, OrderItem
+
+_UNKNOWN = object()
 
 @receiver(pre_save, sender=Order)
-def _capture_prev_status(sender, instance: Order, **kwargs):
+def _capture_prev_status(sender, instance: Order, update_fields=None, **kwargs):
     if not instance.pk:
         instance._prev_status = None
         return
-    try:
-        old = Order.objects.get(pk=instance.pk)
-        instance._prev_status = old.status
-    except Order.DoesNotExist:
-        instance._prev_status = None
+    # status를 저장하지 않는 save(update_fields=[...])는 상태 변화가 없음
+    if update_fields is not None and "status" not in update_fields:
+        instance._prev_status = instance.status
+        return
+    prev = getattr(instance, "_loaded_status", _UNKNOWN)
+    if prev is _UNKNOWN:
+        # DB에서 불러오지 않은 인스턴스(Order(pk=...))나 status를 defer한 경우만 조회
+        prev = Order.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+    instance._prev_status = prev
 
 @receiver(post_save, sender=Order)
 def _apply_or_unapply_on_change(sender, instance: Order, created, **kwargs):
-    if created:
-        return
     prev = getattr(instance, "_prev_status", None)
     now = instance.status
+    # 다음 save()의 비교 기준
+    instance._loaded_status = now
+    if created:
+        return
 
     # prev != confirmed → now == confirmed  ⇒ 차감
     if prev != Order.Status.CONFIRMED and now == Order.Status.CONFIRMED:
@@ -31,3 +41,39 @@ def _apply_or_unapply_on_change(sender, instance: Order, created, **kwargs):
         if instance.stock_applied:
             instance.unapply_stock()
         return
+
+
+# ── 재고 원장 ──
+# 관리자 화면 등에서 Part.stock을 직접 고친 경우 입력한 값이 그대로 재고가 되도록
+# 원장 합계와의 차이를 조정 이력으로 남긴다.
+# 재고를 고치지 않은 저장은 아무것도 하지 않는다 (Part.save가 stock을 쓰지 않음).
+@receiver(post_save, sender=Part)
+def _record_stock_edit(sender, instance: Part, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        if instance.stock:
+            InventoryMovement.objects.create(part=instance, delta=instance.stock,
+                                             kind=InventoryMovement.Kind.RESTOCK, memo="부품 등록")
+        instance._loaded_stock = instance.stock
+        return
+    if update_fields is not None and "stock" not in update_fields:
+        return
+    loaded = getattr(instance, "_loaded_stock", None)
+    if loaded is None or instance.stock == loaded:
+        return
+    ledger = instance.movements.aggregate(total=Sum("delta"))["total"] or 0
+    delta = instance.stock - ledger
+    if delta:
+        InventoryMovement.objects.create(part=instance, delta=delta,
+                                         kind=InventoryMovement.Kind.ADJUST, memo="재고 수정")
+    instance._loaded_stock = instance.stock
+
+
+# ── 주문 합계 캐시 ──
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def _refresh_order_totals(sender, instance: OrderItem, raw=False, **kwargs):
+    if raw:
+        return
+    Order.objects.filter(pk=instance.order_id).refresh_totals()
@@ -1,3 +1,357 @@
-from django.test import TestCase
+import json
+from io import StringIO
+from unittest import mock
+from datetime import timedelta
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from parts.models import CarManufacturer, CarModel, Part, PartImage
+from .cart import CART_SESSION_ID
+from .checkout import OrderError, place_order
+from .inventory import apply_stock, record_movements, unapply_stock
+from .models import InventoryMovement, Order, OrderItem
+from .views import GUEST_LOOKUP_RATE
 
 # Create your tests here.
+
+
+class CartTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = CarManufacturer.objects.create(name="현대")
+        car_model = CarModel.objects.create(manufacturer=manufacturer, name="쏘나타")
+        cls.parts = []
+        for i in range(3):
+            part = Part.objects.create(title=f"부품 {i}", car_model=car_model, price=1000 * (i + 1), stock=5)
+            PartImage.objects.create(part=part, image=f"parts/{i}.jpg")
+            cls.parts.append(part)
+
+    def setUp(self):
+        cache.clear()
+
+    def fill_cart(self, items):
+        session = self.client.session
+        session[CART_SESSION_ID] = {str(pid): {"qty": qty} for pid, qty in items}
+        session.save()
+
+    def test_cart_page_loads_parts_once(self):
+        self.fill_cart([(p.id, 2) for p in self.parts])
+        # 세션 + 제조사 메뉴(캐시 전) + 부품(select_related) + 이미지 prefetch
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("shop:cart_detail"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<span id="cart-total">12,000</span>원', html=False)
+
+    def test_stale_items_removed_in_one_pass(self):
+        self.fill_cart([(self.parts[0].id, 1), (999998, 1), (999999, 3)])
+        self.client.get(reverse("shop:cart_detail"))
+        self.assertEqual(self.client.session[CART_SESSION_ID], {str(self.parts[0].id): {"qty": 1}})
+
+    def post_json(self, name, data):
+        return self.client.post(reverse(name), data=json.dumps(data), content_type="application/json")
+
+    def test_ajax_update_returns_payload(self):
+        part = self.parts[1]
+        self.fill_cart([(self.parts[0].id, 1), (part.id, 1)])
+        response = self.post_json("shop:update_ajax", {"product_id": part.id, "qty": 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "ok": True, "qty": 7, "item_subtotal": 14000, "cart_total": 15000,
+            "stock": 5, "stock_ok": False,
+            "has_inquiry_only": False, "has_stock_issue": True, "count": 2,
+        })
+        self.assertEqual(self.client.session[CART_SESSION_ID][str(part.id)], {"qty": 7})
+
+    def test_ajax_add_remove_and_summary(self):
+        part = self.parts[2]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post_json("shop:add_ajax", {"product_id": part.id, "qty": 2})
+        # 세션 쿼리 외에는 부품 조회 한 번
+        self.assertEqual(len([q for q in ctx.captured_queries if "django_session" not in q["sql"]
+                              and "SAVEPOINT" not in q["sql"]]), 1)
+        self.assertEqual(response.json()["cart_total"], 6000)
+
+        response = self.post_json("shop:remove_ajax", {"product_id": part.id})
+        self.assertEqual(response.json()["qty"], 0)
+        self.assertEqual(response.json()["count"], 0)
+
+        response = self.client.get(reverse("shop:summary_ajax"))
+        self.assertEqual(response.json()["cart_total"], 0)
+
+    def test_ajax_rejects_unknown_part_and_bad_payload(self):
+        response = self.post_json("shop:update_ajax", {"product_id": 999999, "qty": 1})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("999999", self.client.session.get(CART_SESSION_ID, {}))
+
+        response = self.client.post(reverse("shop:update_ajax"), data="oops", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+class PlaceOrderTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = CarManufacturer.objects.create(name="기아")
+        car_model = CarModel.objects.create(manufacturer=manufacturer, name="모닝")
+        cls.parts = [
+            Part.objects.create(title=f"부품 {i}", car_model=car_model, price=5000, stock=2)
+            for i in range(5)
+        ]
+
+    def guest_order(self):
+        return Order(guest_name="홍길동", guest_hp="010-1234-5678", guest_email="a@example.com")
+
+    def test_constant_query_count(self):
+        # 트랜잭션(SAVEPOINT 2) + 잠금 조회 + 예약 집계 + Order INSERT + OrderItem bulk INSERT
+        for count in (1, 5):
+            with self.assertNumQueries(6):
+                order = place_order(self.guest_order(), [(p.id, 1) for p in self.parts[:count]])
+            self.assertEqual(order.items.count(), count)
+            self.assertIsNotNone(order.reserved_until)
+
+    def test_reservation_blocks_oversell(self):
+        part = self.parts[0]
+        place_order(self.guest_order(), [(part.id, 2)])
+        with self.assertRaises(OrderError):
+            place_order(self.guest_order(), [(part.id, 1)])
+        self.assertEqual(Order.objects.count(), 1)
+
+        # 예약 기한이 지나면 다시 주문 가능
+        Order.objects.update(reserved_until=timezone.now() - timedelta(minutes=1))
+        place_order(self.guest_order(), [(part.id, 1)])
+
+    def test_inquiry_part_rejected(self):
+        part = self.parts[1]
+        Part.objects.filter(pk=part.pk).update(price=0)
+        with self.assertRaises(OrderError):
+            place_order(self.guest_order(), [(part.id, 1)])
+        self.assertFalse(Order.objects.exists())
+
+    def test_locked_database_is_order_error(self):
+        # SQLite 쓰기 잠금을 busy_timeout 안에 못 얻으면 500 대신 주문 오류 메시지
+        locked = OperationalError("database is locked")
+        with mock.patch("shop.checkout.reserved_quantities", side_effect=locked):
+            with self.assertRaisesMessage(OrderError, "잠시 후 다시 시도"):
+                place_order(self.guest_order(), [(self.parts[4].id, 1)])
+        self.assertFalse(Order.objects.exists())
+
+    def test_order_create_from_cart(self):
+        session = self.client.session
+        session[CART_SESSION_ID] = {str(self.parts[2].id): {"qty": 2}, str(self.parts[3].id): {"qty": 1}}
+        session.save()
+        response = self.client.post(reverse("shop:order_create"), {
+            "guest_name": "홍길동", "guest_hp": "010-1234-5678",
+            "guest_email": "a@example.com", "guest_password": "1234",
+        })
+        order = Order.objects.get()
+        self.assertRedirects(response, reverse("shop:order_complete", args=[order.id]))
+        self.assertEqual(sorted(order.items.values_list("part_id", "quantity")),
+                         [(self.parts[2].id, 2), (self.parts[3].id, 1)])
+        self.assertEqual(self.client.session[CART_SESSION_ID], {})
+
+
+class BatchInventoryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = CarManufacturer.objects.create(name="쉐보레")
+        car_model = CarModel.objects.create(manufacturer=manufacturer, name="스파크")
+        cls.a = Part.objects.create(title="A", car_model=car_model, price=1000, stock=10)
+        cls.b = Part.objects.create(title="B", car_model=car_model, price=1000, stock=1)
+        cls.orders = []
+        for i in range(4):
+            order = Order.objects.create(guest_name=f"손님{i}")
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, part=cls.a, title="A", unit_price=1000, quantity=2),
+                OrderItem(order=order, part=cls.b, title="B", unit_price=1000, quantity=1),
+            ])
+            cls.orders.append(order)
+
+    def stocks(self):
+        return dict(Part.objects.values_list("title", "stock"))
+
+    def test_apply_and_unapply_in_constant_queries(self):
+        orders = Order.objects.filter(id__in=[o.id for o in self.orders])
+        # SAVEPOINT 4 + 주문 잠금 + (주문, 부품)별 수량 + 원장 합계 + 이력 INSERT + 부품 재고 UPDATE + 주문 UPDATE
+        with self.assertNumQueries(10):
+            self.assertEqual(apply_stock(orders), 4)
+        self.assertEqual(self.stocks(), {"A": 2, "B": 0})
+        self.assertEqual(apply_stock(orders), 0)  # 중복 차감 없음
+        # B는 첫 주문만 차감, 나머지는 부족분으로 기록 (원장이 음수가 되지 않음)
+        b_movements = InventoryMovement.objects.filter(part=self.b, kind="order").order_by("order_id")
+        self.assertEqual(list(b_movements.values_list("delta", "memo")),
+                         [(-1, "")] + [(0, "재고 부족 1개")] * 3)
+
+        # SAVEPOINT 4 + 주문 잠금 + (주문, 부품)별 차감 합계 + 이력 INSERT + 부품 재고 UPDATE + 주문 UPDATE
+        with self.assertNumQueries(9):
+            self.assertEqual(unapply_stock(orders.filter(id__in=[self.orders[3].id])), 1)
+        # 차감하지 못한 B는 복원하지 않음
+        self.assertEqual(self.stocks(), {"A": 4, "B": 0})
+        self.assertEqual(unapply_stock(orders.filter(id__in=[self.orders[0].id])), 1)
+        self.assertEqual(self.stocks(), {"A": 6, "B": 1})
+        self.assertEqual(orders.filter(stock_applied=True).count(), 2)
+
+    def test_single_order_methods_still_work(self):
+        order = self.orders[0]
+        order.status = Order.Status.CONFIRMED
+        order.save()
+        self.assertEqual(self.stocks(), {"A": 8, "B": 0})
+        order.status = Order.Status.CANCELLED
+        order.save()
+        self.assertEqual(self.stocks(), {"A": 10, "B": 1})
+
+    def test_status_save_does_not_reread_order(self):
+        order = Order.objects.get(pk=self.orders[0].pk)
+        order.memo = "메모"
+        # UPDATE 한 번 (이전 상태는 불러올 때 기억한 값 사용)
+        with self.assertNumQueries(1):
+            order.save()
+
+    def test_bulk_transition(self):
+        orders = Order.objects.filter(id__in=[o.id for o in self.orders[:2]])
+        self.assertEqual(orders.transition(Order.Status.CONFIRMED), 2)
+        self.assertEqual(self.stocks(), {"A": 6, "B": 0})
+        self.assertEqual(orders.filter(status=Order.Status.CONFIRMED, stock_applied=True).count(), 2)
+
+        self.assertEqual(orders.transition(Order.Status.CANCELLED), 2)
+        # 실제로 차감한 만큼만 복원되므로 B도 원래대로
+        self.assertEqual(self.stocks(), {"A": 10, "B": 1})
+        self.assertFalse(orders.filter(stock_applied=True).exists())
+
+
+class InventoryLedgerTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = CarManufacturer.objects.create(name="르노")
+        car_model = CarModel.objects.create(manufacturer=manufacturer, name="QM6")
+        cls.part = Part.objects.create(title="휠", car_model=car_model, price=1000, stock=3)
+
+    def test_stock_edit_is_recorded(self):
+        part = Part.objects.get(pk=self.part.pk)
+        part.stock = 7
+        part.save()
+        self.assertEqual(list(part.movements.values_list("kind", "delta").order_by("id")),
+                         [("restock", 3), ("adjust", 4)])
+
+        # 주문 차감 후 예전 값으로 저장해도 원장 기준 재고 유지
+        order = Order.objects.create(guest_name="손님")
+        OrderItem.objects.create(order=order, part=part, title="휠", unit_price=1000, quantity=2)
+        apply_stock(Order.objects.filter(pk=order.pk))
+        part.title = "휠 (정품)"
+        part.save()
+        part.refresh_from_db()
+        self.assertEqual(part.stock, 5)
+
+    def test_oversell_then_restock(self):
+        # 재고 3에 5개 주문 입금확인 → 3개만 차감, 원장 0 (음수가 되지 않음)
+        order = Order.objects.create(guest_name="손님")
+        OrderItem.objects.create(order=order, part=self.part, title="휠", unit_price=1000, quantity=5)
+        apply_stock(Order.objects.filter(pk=order.pk))
+        part = Part.objects.get(pk=self.part.pk)
+        self.assertEqual(part.stock, 0)
+        self.assertEqual(part.movements.latest("id").memo, "재고 부족 2개")
+
+        # 재고 이력 화면에서 입고 1 → 그대로 재고에 반영
+        record_movements([InventoryMovement(part=part, delta=1, kind=InventoryMovement.Kind.RESTOCK)])
+        part.refresh_from_db()
+        self.assertEqual(part.stock, 1)
+
+        # 주문 취소는 차감한 3개만 복원
+        unapply_stock(Order.objects.filter(pk=order.pk))
+        part.refresh_from_db()
+        self.assertEqual(part.stock, 4)
+
+        # 관리자가 입력한 값이 그대로 재고, 원장 합계와 일치
+        part.stock = 5
+        part.save()
+        part.refresh_from_db()
+        self.assertEqual(part.stock, 5)
+        self.assertEqual(part.movements.aggregate(total=Sum("delta"))["total"], 5)
+
+    def test_save_without_stock_change_keeps_stock(self):
+        # 원장 밖에서 들어온 재고(bulk_create 등)도 다른 필드만 고칠 때는 그대로
+        Part.objects.filter(pk=self.part.pk).update(stock=7)
+        part = Part.objects.select_related("car_model__manufacturer").get(pk=self.part.pk)
+        part.title = "휠 (정품)"
+        with self.assertNumQueries(1):
+            part.save()
+        part.refresh_from_db()
+        self.assertEqual((part.title, part.stock), ("휠 (정품)", 7))
+        self.assertEqual(part.movements.count(), 1)
+
+    def test_movements_are_append_only(self):
+        movement = self.part.movements.get()
+        movement.delta = 10
+        with self.assertRaises(ValueError):
+            movement.save()
+        with self.assertRaises(ValueError):
+            movement.delete()
+
+    def test_reconcile_command(self):
+        Part.objects.filter(pk=self.part.pk).update(stock=99)
+        call_command("reconcile_stock", stdout=StringIO())
+        self.part.refresh_from_db()
+        self.assertEqual(self.part.stock, 3)
+
+        Part.objects.filter(pk=self.part.pk).update(stock=8)
+        call_command("reconcile_stock", "--adopt", stdout=StringIO())
+        self.part.refresh_from_db()
+        self.assertEqual(self.part.stock, 8)
+        self.assertEqual(self.part.movements.aggregate(total=Sum("delta"))["total"], 8)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class GuestLookupTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            Order.objects.create(guest_name="김철수", guest_hp=f"010-0000-000{i}",
+                                 guest_password=make_password("pw"))
+        self.target = Order.objects.create(guest_name="김철수", guest_hp="010-1234-5678",
+                                           guest_password=make_password("secret"))
+
+    def lookup(self, hp="01012345678", password="secret", name="김철수"):
+        return self.client.post(reverse("shop:guest_lookup"), {"name": name, "hp": hp, "password": password})
+
+    def test_single_hash_check(self):
+        with mock.patch("shop.models.check_password", wraps=check_password) as checker:
+            response = self.lookup()
+        self.assertEqual(checker.call_count, 1)
+        self.assertEqual(response.context["order"], self.target)
+
+        response = self.lookup(password="wrong")
+        self.assertIsNone(response.context["order"])
+
+    def test_rate_limited_per_name(self):
+        limit, _ = GUEST_LOOKUP_RATE
+        for _ in range(limit):
+            self.assertEqual(self.lookup(password="wrong").status_code, 200)
+        with mock.patch("shop.models.check_password") as checker:
+            response = self.lookup()
+        self.assertEqual(response.status_code, 429)
+        checker.assert_not_called()
+
+
+class OrderTotalsCacheTest(TestCase):
+    def test_totals_follow_item_writes(self):
+        order = Order.objects.create(guest_name="손님")
+        item = OrderItem.objects.create(order=order, title="A", unit_price=1500, quantity=2)
+        OrderItem.objects.create(order=order, title="B", unit_price=None, quantity=1)
+        order.refresh_from_db()
+        self.assertEqual((order.total_amount, order.item_count), (3000, 3))
+
+        item.delete()
+        stale = Order.objects.get(pk=order.pk)
+        self.assertEqual((stale.total_amount, stale.item_count), (0, 1))
+
+        # 오래된 인스턴스를 저장해도 캐시 컬럼은 덮어쓰지 않음
+        order.memo = "메모"
+        order.save()
+        order.refresh_from_db()
+        self.assertEqual((order.total_amount, order.item_count), (0, 1))
@@ -9,6 +9,9 @@ urlpatterns = [
     path("update/<int:part_id>/", views.cart_update, name="update"),
     path("remove/<int:part_id>/", views.cart_remove, name="remove"),
     path("cart/update-ajax/", views.cart_update_ajax, name="update_ajax"),
+    path("cart/add-ajax/", views.cart_add_ajax, name="add_ajax"),
+    path("cart/remove-ajax/", views.cart_remove_ajax, name="remove_ajax"),
+    path("cart/summary/", views.cart_summary_ajax, name="summary_ajax"),
 
     path("order/", views.order_form, name="order_form"),                 # 회원/비회원 공용 시작
     path("order/create/", views.order_create, name="order_create"),  # POST 전용(생성)
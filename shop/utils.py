@@ -0,0 +1,29 @@
+import hashlib
+import re
+
+from django.core.cache import cache
+
+
+def make_guest_lookup_key(name, hp):
+    """비회원 주문 조회 키: (이름, 휴대폰 숫자) 해시 → 인덱스로 한 건만 찾기 위함"""
+    digits = re.sub(r"\D", "", hp or "")
+    name = (name or "").strip()
+    if not (name and digits):
+        return ""
+    return hashlib.sha256(f"{name}:{digits}".encode()).hexdigest()
+
+
+def rate_limited(key, limit, window):
+    """
+    window초 동안 key로 limit번까지 허용 (캐시 카운터).
+    이번 시도가 한도를 넘었으면 True.
+    """
+    cache_key = "ratelimit:" + hashlib.md5(key.encode()).hexdigest()
+    cache.add(cache_key, 0, window)
+    try:
+        count = cache.incr(cache_key)
+    except ValueError:
+        # 그 사이 만료됨 → 새 창 시작
+        cache.set(cache_key, 1, window)
+        count = 1
+    return count > limit
@@ -1,49 +1,100 @@
+from django.conf import settings
 from django.shortcuts import redirect, render, get_object_or_404
 from django.urls import reverse
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from django.contrib import messages
 from .cart import Cart
+from .checkout import OrderError, place_order
+from .utils import make_guest_lookup_key, rate_limited
 from parts.models import Part
 from django.views.decorators.http import require_http_methods
-from .models import Order, OrderItem
+from .models import Order
 from django.contrib.auth.hashers import make_password
 from django.http import JsonResponse
 import json
 from django.views.decorators.http import require_http_methods
-from django.db import transaction
 
-@require_POST
-def cart_update_ajax(request):
+def _json_payload(request):
+    """JSON 본문 또는 폼 POST에서 (product_id, qty) 읽기"""
+    if request.content_type == "application/json":
+        data = json.loads(request.body.decode() or "{}")
+    else:
+        data = request.POST
+    return int(data.get("product_id")), int(data.get("qty", 1))
+
+
+def _cart_response(cart, part_id=None, status=200):
     """
-    요청: {product_id:int, qty:int}
     응답: {
       ok:bool, qty:int, item_subtotal:int, cart_total:int,
       stock:int|null, stock_ok:bool|null,
-      has_inquiry_only:bool, has_stock_issue:bool
+      has_inquiry_only:bool, has_stock_issue:bool, count:int
     }
+    part_id가 없거나(요약) 장바구니에 없는 부품이면 qty=0, item_subtotal=0, stock/stock_ok=null
     """
+    item = cart.get_item(part_id) if part_id is not None else None
+    has_stock = item is not None and item["stock"] is not None
+    return JsonResponse({
+        "ok": status == 200,
+        "qty": item["qty"] if item else 0,
+        "item_subtotal": int(item["subtotal"]) if item else 0,
+        "cart_total": int(cart.total()),
+        "stock": item["stock"] if has_stock else None,
+        "stock_ok": bool(item["stock_ok"]) if has_stock else None,
+        "has_inquiry_only": cart.has_inquiry_only(),
+        "has_stock_issue": cart.has_stock_issue(),
+        "count": len(cart),
+    }, status=status)
+
+
+def _cart_change_ajax(request, replace):
     try:
-      payload = json.loads(request.body.decode())
-      product_id = int(payload.get("product_id"))
-      qty = max(1, int(payload.get("qty", 1)))
-    except Exception:
-      return JsonResponse({"ok": False, "error": "잘못된 요청"}, status=400)
+        product_id, qty = _json_payload(request)
+    except (AttributeError, TypeError, ValueError):
+        return JsonResponse({"ok": False, "error": "잘못된 요청"}, status=400)
+    if qty < 1:
+        return JsonResponse({"ok": False, "error": "수량은 1개 이상이어야 합니다."}, status=400)
 
-    # 장바구니/상품 로직은 프로젝트에 맞게 바꿔주세요
-    cart = request.cart  # 미들웨어나 헬퍼로 세션 카트 접근한다고 가정
-    item = cart.update(product_id=product_id, qty=qty)   # 수량 갱신
-    cart.recalculate()                                   # 합계/상태 갱신
+    # 부품 존재 확인은 장바구니 스냅샷 조회로 대신함 (없는 부품은 스냅샷에서 빠짐)
+    cart = Cart(request, with_images=False)
+    cart.add(product_id, qty=qty, replace=replace)
+    if cart.get_item(product_id) is None:
+        return JsonResponse({"ok": False, "error": "존재하지 않는 상품입니다."}, status=404)
+    return _cart_response(cart, product_id)
 
-    return JsonResponse({
-        "ok": True,
-        "qty": item.qty,
-        "item_subtotal": int(item.subtotal or 0),
-        "cart_total": int(cart.total or 0),
-        "stock": item.stock if item.stock is not None else None,
-        "stock_ok": bool(item.stock_ok) if item.stock is not None else None,
-        "has_inquiry_only": bool(cart.has_inquiry_only),
-        "has_stock_issue": bool(cart.has_stock_issue),
-    })
+
+@require_POST
+def cart_add_ajax(request):
+    """요청: {product_id:int, qty:int} → 수량 추가"""
+    return _cart_change_ajax(request, replace=False)
+
+
+@require_POST
+def cart_update_ajax(request):
+    """요청: {product_id:int, qty:int} → 수량 변경"""
+    return _cart_change_ajax(request, replace=True)
+
+
+@require_POST
+def cart_remove_ajax(request):
+    """요청: {product_id:int} → 삭제"""
+    try:
+        product_id, _ = _json_payload(request)
+    except (AttributeError, TypeError, ValueError):
+        return JsonResponse({"ok": False, "error": "잘못된 요청"}, status=400)
+    cart = Cart(request, with_images=False)
+    cart.remove(product_id)
+    return _cart_response(cart, product_id)
+
+
+@require_GET
+def cart_summary_ajax(request):
+    """장바구니 합계/상태만 (?product_id= 를 주면 해당 줄 정보 포함)"""
+    try:
+        product_id = int(request.GET["product_id"]) if request.GET.get("product_id") else None
+    except ValueError:
+        product_id = None
+    return _cart_response(Cart(request, with_images=False), product_id)
 
 def cart_detail(request):
     cart = Cart(request)
@@ -134,22 +185,18 @@ def order_form(request):
                 return redirect("shop:order_form")
             order.guest_password = make_password(raw_pw)
             order.memo = request.POST.get("memo", "")
-        order.save()
-
-        for i in items:
-            p = i["product"]
-            OrderItem.objects.create(
-                order=order,
-                part=p,
-                title=getattr(p, "title", str(p)),
-                unit_price=i["price"],
-                quantity=i["qty"],
-            )
+
+        # 재고 확인/주문 저장은 부품 행 잠금 후 한 트랜잭션에서 (위 검사는 화면 표시용 스냅샷)
+        try:
+            place_order(order, [(i["product"].id, i["qty"]) for i in items])
+        except OrderError as e:
+            messages.error(request, str(e))
+            return redirect("shop:order_form")
 
         if using_cart:
             cart.clear()
 
-        return redirect("shop:complete", order_id=order.id)
+        return redirect("shop:order_complete", order_id=order.id)
 
     ctx = {
         "is_member": request.user.is_authenticated,
@@ -168,13 +215,12 @@ def order_form(request):
     return render(request, "orders/order_form.html", ctx)
 
 @require_POST
-@transaction.atomic
 def order_create(request):
     is_member = request.user.is_authenticated
 
     # 1) 주문 기본 정보
     if is_member:
-        order = Order.objects.create(
+        order = Order(
             user=request.user,
             memo=request.POST.get("memo", "")
         )
@@ -188,7 +234,7 @@ def order_create(request):
             messages.error(request, "비회원 정보가 누락되었습니다.")
             return redirect("shop:order_form")
 
-        order = Order.objects.create(
+        order = Order(
             user=None,
             guest_name=guest_name,
             guest_hp=guest_hp,
@@ -199,50 +245,74 @@ def order_create(request):
 
     # 2) 아이템 구성 (바로구매 또는 장바구니)
     part_id = request.POST.get("part_id")
-    qty     = int(request.POST.get("qty") or 1)
+    try:
+        qty = int(request.POST.get("qty") or 1)
+    except ValueError:
+        qty = 1
 
+    cart = Cart(request, with_images=False)
     if part_id:  # 바로구매
-        part = get_object_or_404(Part, pk=part_id)
-        unit_price = None if (getattr(part, "price", 0) in [None, 0]) else int(part.price)
-        OrderItem.objects.create(
-            order=order,
-            part=part,
-            title=getattr(part, "title", str(part)),
-            unit_price=unit_price,  # None이면 전화문의
-            quantity=qty,
-        )
+        lines = [(part_id, qty)]
     else:
-        # TODO: 장바구니에서 가져오는 로직 연결
-        # for ci in cart_items:
-        #     OrderItem.objects.create(order=order, part=ci.part, title=ci.part.title,
-        #                              unit_price=ci.part.price or None, quantity=ci.qty)
-        pass
+        lines = [(item["product"].id, item["qty"]) for item in cart]
+
+    # 3) 부품 행 잠금 → 재고 확인 → 주문/아이템 저장 (한 트랜잭션)
+    try:
+        place_order(order, lines)
+    except (OrderError, ValueError) as e:
+        messages.error(request, str(e) if isinstance(e, OrderError) else "잘못된 요청입니다.")
+        if part_id:
+            return redirect(f"{reverse('shop:order_form')}?part_id={part_id}&qty={qty}")
+        return redirect("shop:order_form")
 
-    # 3) 완료 페이지로 이동(또는 결제 페이지)
+    if not part_id:
+        cart.clear()
+
+    # 4) 완료 페이지로 이동(또는 결제 페이지)
     messages.success(request, "주문이 접수되었습니다.")
     return redirect("shop:order_complete", order_id=order.id)
 
 def order_complete(request, order_id):
     order = get_object_or_404(Order, pk=order_id)
-    total_amount = sum((item.subtotal() for item in order.items.all()), 0)
+    total_amount = order.total_amount
     return render(request, "orders/order_complete.html", {
         "order": order,
         "total_amount": total_amount,
     })
 
+# 비회원 주문 조회 시도 한도: (횟수, 초) - IP별, 이름별 각각
+GUEST_LOOKUP_RATE = getattr(settings, "GUEST_LOOKUP_RATE", (10, 60 * 10))
+
+
 @require_http_methods(["GET", "POST"])
 def guest_lookup(request):
-    order = None
+    order, error, status = None, None, 200
     if request.method == "POST":
         name = request.POST.get("name", "").strip()
+        hp   = request.POST.get("hp", "").strip()
         pw   = request.POST.get("password", "").strip()
-        if name and pw:
-            # 같은 이름이 여러 건일 수 있으니 가장 최근 주문부터 검사
-            for o in Order.objects.filter(user__isnull=True, guest_name=name).order_by("-id")[:20]:
-                if o.check_guest_password(pw):
-                    order = o
-                    break
-    return render(request, "orders/guest_lookup.html", {"order": order})
+        key  = make_guest_lookup_key(name, hp)
+        if key and pw:
+            limit, window = GUEST_LOOKUP_RATE
+            ip = request.META.get("REMOTE_ADDR", "")
+            # 둘 다 세도록 or 대신 따로 평가
+            ip_limited = rate_limited(f"guest_lookup:ip:{ip}", limit, window)
+            name_limited = rate_limited(f"guest_lookup:name:{name}", limit, window)
+            if ip_limited or name_limited:
+                error, status = "조회 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.", 429
+            else:
+                # (이름, 휴대폰) 인덱스로 가장 최근 주문 한 건만 비밀번호 확인
+                candidate = (Order.objects
+                             .filter(user__isnull=True, guest_lookup_key=key)
+                             .order_by("-id")
+                             .first())
+                if candidate and candidate.check_guest_password(pw):
+                    order = candidate
+                else:
+                    error = "일치하는 주문이 없습니다."
+        else:
+            error = "이름, 휴대폰 번호, 주문 비밀번호를 모두 입력해주세요."
+    return render(request, "orders/guest_lookup.html", {"order": order, "error": error}, status=status)
 
 def buy_now(request, part_id):
     part = get_object_or_404(Part, pk=part_id)
@@ -1,3 +1,37 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from shop.models import Order, OrderItem
+from .models import User
 
 # Create your tests here.
+
+
+class MypageOrderHistoryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("member01", "pw-1234!", "홍길동", "member@example.com", "010-1111-2222")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def add_orders(self, count):
+        for i in range(count):
+            order = Order.objects.create(user=self.user)
+            OrderItem.objects.create(order=order, title=f"범퍼 {i}", unit_price=10000, quantity=2)
+            OrderItem.objects.create(order=order, title=f"램프 {i}", unit_price=None, quantity=1)
+
+    def test_fixed_query_count(self):
+        self.add_orders(1)
+        self.client.get(reverse("user:mypage"))  # 메뉴 캐시 채우기
+        # 세션 + 회원 + 주문 COUNT + 주문 페이지 + 아이템 prefetch
+        with self.assertNumQueries(5):
+            self.client.get(reverse("user:mypage"))
+
+        self.add_orders(4)
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse("user:mypage"))
+        order = response.context["page_obj"][0]
+        self.assertEqual((order.total_amount, order.item_count, order.has_inquiry), (20000, 3, True))
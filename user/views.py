@@ -29,8 +29,7 @@ from .decorators import anonymous_required
 from .forms import PasswordResetMatchForm, PasswordResetNewForm
 
 from django.core.paginator import Paginator
-from django.db.models import Sum, F, Value, DecimalField, ExpressionWrapper
-from django.db.models.functions import Coalesce
+from django.db.models import Exists, OuterRef, Prefetch
 # Create your views here..
 class RegisterTermsView(TemplateView):
     template_name = "user/terms.html"
@@ -170,22 +169,15 @@ def logout(request):
 @login_required(login_url='user:login')
 def mypage(request):
     user = request.user
-    from shop.models import Order
-
-    # (단가 × 수량) 라인 합
-    line_total = ExpressionWrapper(
-        F('items__unit_price') * F('items__quantity'),
-        output_field=DecimalField(max_digits=12, decimal_places=0)  # OrderItem.unit_price가 decimal_places=0
-    )
+    from shop.models import Order, OrderItem
 
+    # 합계/상품수는 Order의 캐시 컬럼, 상품명은 페이지 단위로 한 번에 prefetch
     orders_qs = (
         Order.objects
         .filter(user=user)                # 게스트 주문까지 보여주려면 | Q(user__isnull=True, guest_email=user.email)
-        .order_by('-created_at')
-        .annotate(
-            item_count=Coalesce(Sum('items__quantity'), 0),
-            total_amount=Coalesce(Sum(line_total), Value(0, output_field=DecimalField(max_digits=12, decimal_places=0)))
-        )
+        .order_by('-created_at', '-id')
+        .annotate(has_inquiry=Exists(OrderItem.objects.filter(order_id=OuterRef('pk'), unit_price__isnull=True)))
+        .prefetch_related(Prefetch('items', queryset=OrderItem.objects.only('id', 'order_id', 'title').order_by('id')))
     )
 
     page_obj = Paginator(orders_qs, 5).get_page(request.GET.get('page'))